@@ -1,43 +1,277 @@
+from array import array
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from heapq import heappush, heappushpop
+from itertools import islice, repeat
+from operator import gt
+from os import cpu_count
+from threading import Lock
+
+try:
+    import numpy as np
+except ImportError:  # fall back to plain lists
+    np = None
+
+
 class Memoize:
-    def __init__(self, fn):
+    """Cache the results of a function, keyed on its arguments.
+
+    Use it as `@Memoize`, or as `@Memoize(max_size=..., key=...)` to keep at
+    most `max_size` results (evicting the least recently used one) and to
+    memoize on a compact key computed from the arguments instead of the
+    arguments themselves.
+    """
+
+    def __init__(self, fn=None, max_size=None, key=None):
         self.fn = fn
-        self.memo = {}
+        self.max_size = max_size
+        self.key = key
+        self.memo = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = Lock()
 
     def __call__(self, *args):
-        if args not in self.memo:
-            self.memo[args] = self.fn(*args)
-        return self.memo[args]
+        if self.fn is None:  # used as @Memoize(...), so args is the function
+            self.fn = args[0]
+            return self
+
+        memo_key = args if self.key is None else self.key(*args)
+        with self.lock:
+            if memo_key in self.memo:
+                self.hits += 1
+                if self.max_size is not None:
+                    self.memo.move_to_end(memo_key)
+                return self.memo[memo_key]
+            self.misses += 1
+
+        # compute without holding the lock, so recursive calls can use the memo
+        result = self.fn(*args)
+
+        with self.lock:
+            self.memo[memo_key] = result
+            if self.max_size is not None and len(self.memo) > self.max_size:
+                self.memo.popitem(last=False)
+        return result
+
+    def clear(self):
+        """Forget every saved result and reset the hit/miss counters."""
+        with self.lock:
+            self.memo.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """Return the number of hits, misses and saved results."""
+        with self.lock:
+            return {'hits': self.hits, 'misses': self.misses, 'size': len(self.memo)}
+
+
+class _SparseMemo(dict):
+    """A dictionary memo that, like the array memo, gives -1 for cells that
+    haven't been computed yet."""
+
+    def __missing__(self, key):
+        return -1
+
+
+def _new_memo(rows, cols):
+    """Return storage for a rows x cols memo table, indexed by i * cols + j.
+
+    Only small tables (up to 10**5 cells, 800 KB) are a flat array allocated
+    up front. Bigger ones are a dictionary that only holds the cells that
+    actually get computed, so memory follows the work done rather than the
+    size of the table."""
+    if rows * cols <= 10 ** 5:
+        return array('q', [-1]) * (rows * cols)
+    return _SparseMemo()
 
 
-@Memoize
 def lcs(strA, strB):
-    if len(strA) == 0 or len(strB) == 0:
-        return 0
-    elif strA[-1] == strB[-1]:  # if the last characters match
-        return 1 + lcs(strA[:-1], strB[:-1])
-    else:  # if the last characters don't match
-        return max(lcs(strA[:-1], strB), lcs(strA, strB[:-1]))
+    """Determine the length of the Longest Common Subsequence of 2 strings.
+
+    Top-down version: only the cells of the DP table that are needed get
+    computed. It works on indices into the strings instead of slices, and
+    uses an explicit stack instead of recursion, so long strings don't hit
+    the recursion limit."""
+    cols = len(strB) + 1
+    memo = _new_memo(len(strA) + 1, cols)  # memo[i * cols + j] = lcs(strA[:i], strB[:j])
+    stack = [(len(strA), len(strB))]
+
+    while stack:
+        i, j = stack[-1]
+        key = i * cols + j
+        if memo[key] != -1:
+            stack.pop()
+            continue
+        if i == 0 or j == 0:
+            memo[key] = 0
+            stack.pop()
+            continue
+
+        if strA[i-1] == strB[j-1]:  # if the last characters match
+            diagonal = memo[key - cols - 1]
+            if diagonal == -1:
+                stack.append((i-1, j-1))
+                continue
+            memo[key] = 1 + diagonal
+        else:  # if the last characters don't match
+            up = memo[key - cols]
+            left = memo[key - 1]
+            if up == -1 or left == -1:
+                if up == -1:
+                    stack.append((i-1, j))
+                if left == -1:
+                    stack.append((i, j-1))
+                continue
+            memo[key] = max(up, left)
+        stack.pop()
+
+    return memo[len(strA) * cols + len(strB)]
 
 
 def lcs_dp(strA, strB):
-    """Determine the length of the Longest Common Subsequence of 2 strings."""
-    rows = len(strA) + 1
-    cols = len(strB) + 1
+    """Determine the length of the Longest Common Subsequence of 2 strings.
 
-    dp_table = [[0 for j in range(cols)] for i in range(rows)]
+    Only two rows of the DP table are kept at a time, so this uses
+    O(min(len(strA), len(strB))) memory."""
+    # keep the rows as short as possible
+    if len(strB) > len(strA):
+        strA, strB = strB, strA
+    return _lcs_last_row(strA, strB)[-1]
 
-    # Fill in the table using a nested for loop.
 
-    # start at index 1 of dp_table in order to get the diagonal value if i-1 == 0 
-    # or j-1 == 0 (starting at first character of the string)
-    for i in range(1, rows):
+def _lcs_last_row(strA, strB):
+    """Return the last row of the LCS table of strA and strB, i.e. the LCS
+    length of all of strA against every prefix of strB."""
+    cols = len(strB) + 1
+    prev_row = [0] * cols
+
+    # start at index 1 of each row in order to get the diagonal value if j-1 == 0
+    # (starting at first character of the string)
+    for char_a in strA:
+        row = [0] * cols
         for j in range(1, cols):
-            if strA[i-1] == strB[j-1]:
-                dp_table[i][j] = 1 + dp_table[i-1][j-1]
+            if char_a == strB[j-1]:
+                row[j] = 1 + prev_row[j-1]
             else:
-                dp_table[i][j] = max(dp_table[i-1][j], dp_table[i][j-1])
+                row[j] = max(prev_row[j], row[j-1])
+        prev_row = row
+
+    return prev_row
+
+
+def lcs_hirschberg(strA, strB):
+    """Find a Longest Common Subsequence of 2 strings in linear space.
+
+    Uses Hirschberg's divide and conquer: split strA in half, find where the
+    best path crosses that line using one forward and one backward pass of
+    `_lcs_last_row`, then solve the two halves on their own.
 
-    return dp_table[rows-1][cols-1]
+    Returns a tuple (subsequence, matches), where matches is the list of
+    (index in strA, index in strB) pairs of the matched characters."""
+    matches = []
+    _hirschberg(strA, strB, 0, 0, matches)
+    subsequence = ''.join(strA[i] for i, j in matches)
+    return subsequence, matches
+
+
+def _hirschberg(strA, strB, offset_a, offset_b, matches):
+    """Append the matches of an LCS of strA and strB to `matches`, shifting
+    the indices by the offsets of strA and strB in the original strings."""
+    if len(strA) == 0 or len(strB) == 0:
+        return
+    if len(strA) == 1:
+        j = strB.find(strA)
+        if j != -1:
+            matches.append((offset_a, offset_b + j))
+        return
+
+    mid = len(strA) // 2
+    forward = _lcs_last_row(strA[:mid], strB)
+    backward = _lcs_last_row(strA[mid:][::-1], strB[::-1])
+
+    # split strB where the two halves together give the longest LCS
+    cols = len(strB) + 1
+    split = max(range(cols), key=lambda j: forward[j] + backward[cols-1-j])
+
+    _hirschberg(strA[:mid], strB[:split], offset_a, offset_b, matches)
+    _hirschberg(strA[mid:], strB[split:], offset_a + mid, offset_b + split, matches)
+
+
+def _match_masks(string):
+    """Return a dictionary of character -> bitmask of the positions in
+    `string` where that character appears (bit i is set for string[i])."""
+    masks = {}
+    bit = 1
+    for char in string:
+        masks[char] = masks.get(char, 0) | bit
+        bit <<= 1
+    return masks
+
+
+def lcs_bitparallel(strA, strB):
+    """Determine the length of the Longest Common Subsequence of 2 strings.
+
+    Bit-parallel version (Allison-Dix, in Hyyro's form): a whole row of the DP
+    table is stored as the bits of one Python int, so each character of the
+    shorter string costs a handful of big-int operations instead of a loop
+    over the other string."""
+    # the bits run along the longer string, the loop over the shorter one
+    if len(strB) > len(strA):
+        strA, strB = strB, strA
+    if len(strB) == 0:
+        return 0
+
+    masks = _match_masks(strA)
+    all_bits = (1 << len(strA)) - 1
+    row = all_bits  # a 0 bit marks a place where the LCS length goes up by 1
+    for char in strB:
+        matches = row & masks.get(char, 0)
+        row = ((row + matches) | (row - matches)) & all_bits
+
+    return len(strA) - bin(row).count('1')
+
+
+def edit_distance_bitparallel(str1, str2):
+    """Compute the Edit Distance between 2 strings.
+
+    Bit-parallel version (Myers' algorithm, in Hyyro's form for global edit
+    distance): the +1/-1 differences between neighbouring cells of a DP
+    column are stored as the bits of Python ints, so each character of the
+    shorter string costs a handful of big-int operations."""
+    if len(str2) > len(str1):
+        str1, str2 = str2, str1
+    if len(str2) == 0:
+        return len(str1)
+
+    masks = _match_masks(str1)
+    all_bits = (1 << len(str1)) - 1
+    last_bit = 1 << (len(str1) - 1)
+    plus_v = all_bits  # vertical differences of +1
+    minus_v = 0        # vertical differences of -1
+    distance = len(str1)
+
+    for char in str2:
+        eq = masks.get(char, 0)
+        x_v = eq | minus_v
+        x_h = (((eq & plus_v) + plus_v) ^ plus_v) | eq
+        plus_h = (minus_v | ~(x_h | plus_v)) & all_bits
+        minus_h = plus_v & x_h
+
+        # the bottom cell of the column tracks the distance
+        if plus_h & last_bit:
+            distance += 1
+        elif minus_h & last_bit:
+            distance -= 1
+
+        # the top row of the table goes up by 1 each step, hence the | 1
+        plus_h = ((plus_h << 1) | 1) & all_bits
+        minus_h = (minus_h << 1) & all_bits
+        plus_v = (minus_h | ~(x_v | plus_h)) & all_bits
+        minus_v = plus_h & x_v
+
+    return distance
 
 
 def knapsack(items, capacity):
@@ -53,51 +287,174 @@ def knapsack(items, capacity):
         return value_without
     return max(value_with, value_without)
 
-def knapsack_memoized():
-    pass
+def knapsack_memoized(items, capacity):
+    """Return the maximum value that can be stored in the knapsack using the
+    items given.
+
+    Top-down version, memoized on (item index, remaining capacity). It only
+    visits the states that can actually be reached from the full capacity,
+    and uses an explicit stack instead of recursion so long item lists don't
+    hit the recursion limit."""
+    # item = (name, weight, value)
+    num_items = len(items)
+    memo = {}  # (index of next item, remaining capacity) -> best value
+    stack = [(0, capacity)]
+
+    while stack:
+        state = stack[-1]
+        if state in memo:
+            stack.pop()
+            continue
+        index, remaining = state
+        if index == num_items:
+            memo[state] = 0
+            stack.pop()
+            continue
+
+        name, weight, value = items[index]
+        without_state = (index + 1, remaining)
+        with_state = (index + 1, remaining - weight) if weight <= remaining else None
+
+        # work out the smaller problems first, then come back to this one
+        missing = [sub for sub in (without_state, with_state)
+                   if sub is not None and sub not in memo]
+        if missing:
+            stack.extend(missing)
+            continue
 
-def knapsack_dp(items, capacity):
+        stack.pop()
+        best = memo[without_state]
+        if with_state is not None:
+            best = max(best, value + memo[with_state])
+        memo[state] = best
+
+    return memo[(0, capacity)]
+
+def _knapsack_dtype(items):
+    """Return the NumPy dtype that holds every item value (and any sum of
+    them) exactly, or None if the plain-list path should be used."""
+    if np is None:
+        return None
+    values = [value for name, weight, value in items]
+    if all(isinstance(value, int) for value in values):
+        if sum(abs(value) for value in values) < 2 ** 63:
+            return np.int64
+        return None  # sums could overflow int64
+    if all(isinstance(value, (int, float)) for value in values):
+        return np.float64
+    return None
+
+def knapsack_dp(items, capacity, return_items=False):
     """Return the maximum value that can be stored in the knapsack using the
-    items given."""
+    items given.
+
+    Only one row of the DP table is kept: row[c] is the best value for a
+    capacity of c using the items seen so far. Each item updates the whole row
+    at once from a shifted copy of it (with a single NumPy `maximum` when NumPy
+    is installed and every value fits in an int64 or float64).
+
+    If return_items is True, return (value, chosen items) instead. To find the
+    chosen items, one bit per capacity is kept for each item, recording
+    whether taking it improved that cell."""
     # item = (name, weight, value)
+    dtype = _knapsack_dtype(items)
+    use_numpy = dtype is not None
+    if use_numpy:
+        row = np.zeros(capacity + 1, dtype=dtype)
+    else:
+        row = [0] * (capacity + 1)
 
-    rows = len(items) + 1
-    cols = capacity + 1
-    dp_table = [[0 for j in range(cols)] for i in range(rows)]
+    taken = []  # per item: which capacities >= weight took it, or None
+    for name, weight, value in items:
+        if weight > capacity:
+            taken.append(None)
+            continue
+        # candidate[k] is the value at capacity k + weight if we take this item
+        if use_numpy:
+            candidate = row[:capacity + 1 - weight] + value
+            if return_items:
+                taken.append(np.packbits(candidate > row[weight:]))
+            np.maximum(row[weight:], candidate, out=row[weight:])
+        else:
+            candidate = [v + value for v in row[:capacity + 1 - weight]]
+            without = row[weight:]
+            if return_items:
+                taken.append(bytes(map(gt, candidate, without)))
+            row[weight:] = map(max, without, candidate)
 
-    # Fill in the table using a nested for loop.
-    for i in range(1, rows):
-        for capacity in range(1, cols):
-            j = i-1 # index of each item starting from 0
-            name, weight, value = items[j]
-            val_1 = dp_table[i-1][capacity]
-            val_2 = dp_table[i-1][capacity - weight] + value
-            if capacity - weight < 0:
-                dp_table[i][capacity] = val_1
-            else:
-                dp_table[i][capacity] = max(val_1, val_2)
+    best_value = row[capacity].item() if use_numpy else row[capacity]
+    if not return_items:
+        return best_value
 
-    return dp_table[rows-1][cols-1]
+    # walk back from the last item, following the capacity each choice left
+    chosen = []
+    remaining = capacity
+    for item, item_taken in zip(reversed(items), reversed(taken)):
+        if item_taken is None or remaining < item[1]:
+            continue
+        k = remaining - item[1]
+        if use_numpy:
+            was_taken = (item_taken[k >> 3] >> (7 - (k & 7))) & 1
+        else:
+            was_taken = item_taken[k]
+        if was_taken:
+            chosen.append(item)
+            remaining = k
+    chosen.reverse()
+    return best_value, chosen
 
-@Memoize
 def edit_distance(str1, str2):
-    """Compute the Edit Distance between 2 strings."""
-    if len(str1) == 0 or len(str2) == 0:
-        return max(len(str1), len(str2))
-    
-    modify = edit_distance(str1[:-1], str2[:-1])
+    """Compute the Edit Distance between 2 strings.
 
-    if str1[-1] == str2[-1]:
-        return modify
+    Top-down version: only the cells of the DP table that are needed get
+    computed (just the diagonal, for strings that are the same). It works on
+    indices into the strings and uses an explicit stack instead of recursion."""
+    cols = len(str2) + 1
+    memo = _new_memo(len(str1) + 1, cols)  # memo[r * cols + c] = distance of str1[:r], str2[:c]
+    stack = [(len(str1), len(str2))]
+
+    while stack:
+        r, c = stack[-1]
+        key = r * cols + c
+        if memo[key] != -1:
+            stack.pop()
+            continue
+        if r == 0 or c == 0:
+            memo[key] = max(r, c)
+            stack.pop()
+            continue
 
-    insert = edit_distance(str1, str2[:-1])
-    delete = edit_distance(str1[:-1], str2)
+        modify = memo[key - cols - 1]
+        if str1[r-1] == str2[c-1]:
+            if modify == -1:
+                stack.append((r-1, c-1))
+                continue
+            memo[key] = modify
+        else:
+            insert = memo[key - 1]
+            delete = memo[key - cols]
+            if modify == -1 or insert == -1 or delete == -1:
+                if modify == -1:
+                    stack.append((r-1, c-1))
+                if insert == -1:
+                    stack.append((r, c-1))
+                if delete == -1:
+                    stack.append((r-1, c))
+                continue
+            memo[key] = 1 + min(insert, delete, modify)
+        stack.pop()
 
-    return 1 + min(insert, delete, modify)
+    return memo[len(str1) * cols + len(str2)]
 
 
-def edit_distance_dp(str1, str2):
-    """Compute the Edit Distance between 2 strings."""
+def edit_distance_dp(str1, str2, max_distance=None):
+    """Compute the Edit Distance between 2 strings.
+
+    If `max_distance` is given, only check whether the distance is at most
+    max_distance: return the distance if it is, and None if it is more."""
+    if max_distance is not None:
+        return _edit_distance_banded(str1, str2, max_distance)
+
     rows = len(str1) + 1 
     cols = len(str2) + 1
     dp_table = [[0 for j in range(cols)] for i in range(rows)]
@@ -119,3 +476,270 @@ def edit_distance_dp(str1, str2):
             dp_table[r][c] = 1 + min(insert, delete, modify)
 
     return dp_table[-1][-1]
+
+
+def edit_distance_script(str1, str2):
+    """Generate the operations that turn str1 into str2 with the fewest edits.
+
+    Yields tuples (operation, i, j) in order, where operation is one of
+    'match', 'substitute', 'insert' or 'delete', i is the index in str1 and j
+    the index in str2 (None for the side an insert or delete doesn't have).
+    The number of non-'match' operations is the Edit Distance.
+
+    Uses Hirschberg's divide and conquer, so only a couple of DP rows are in
+    memory at once, and operations are yielded as soon as they are known."""
+    return _edit_script(str1, str2, 0, 0)
+
+
+def _edit_distance_last_row(str1, str2):
+    """Return the last row of the Edit Distance table of str1 and str2, i.e.
+    the distance from all of str1 to every prefix of str2."""
+    cols = len(str2) + 1
+    prev_row = list(range(cols))
+    for r, s1 in enumerate(str1, 1):
+        row = [r] * cols
+        for c in range(1, cols):
+            modify = prev_row[c-1]
+            if s1 == str2[c-1]:
+                row[c] = modify
+            else:
+                row[c] = 1 + min(prev_row[c], row[c-1], modify)
+        prev_row = row
+    return prev_row
+
+
+def _edit_script(str1, str2, offset1, offset2):
+    """Yield the edit script of str1 -> str2, with indices shifted by the
+    offsets of str1 and str2 in the original strings."""
+    if len(str1) == 0:
+        for j in range(len(str2)):
+            yield ('insert', None, offset2 + j)
+        return
+    if len(str2) == 0:
+        for i in range(len(str1)):
+            yield ('delete', offset1 + i, None)
+        return
+    if len(str1) == 1:
+        # keep the character if str2 has it, otherwise substitute the first one
+        match = str2.find(str1)
+        kept = match if match != -1 else 0
+        for j in range(kept):
+            yield ('insert', None, offset2 + j)
+        yield ('match' if match != -1 else 'substitute', offset1, offset2 + kept)
+        for j in range(kept + 1, len(str2)):
+            yield ('insert', None, offset2 + j)
+        return
+
+    mid = len(str1) // 2
+    forward = _edit_distance_last_row(str1[:mid], str2)
+    backward = _edit_distance_last_row(str1[mid:][::-1], str2[::-1])
+
+    # split str2 where the two halves together need the fewest edits
+    cols = len(str2) + 1
+    split = min(range(cols), key=lambda j: forward[j] + backward[cols-1-j])
+
+    yield from _edit_script(str1[:mid], str2[:split], offset1, offset2)
+    yield from _edit_script(str1[mid:], str2[split:], offset1 + mid, offset2 + split)
+
+
+def _edit_distance_banded(str1, str2, max_distance):
+    """Compute the Edit Distance between 2 strings if it is at most
+    max_distance, and return None otherwise.
+
+    A path through the DP table that strays more than max_distance cells from
+    the diagonal already costs more than max_distance, so only that band of
+    2 * max_distance + 1 cells per row is filled in (Ukkonen). We also stop as
+    soon as every cell in a row is over max_distance. This takes
+    O(max_distance * min(len(str1), len(str2))) time."""
+    if abs(len(str1) - len(str2)) > max_distance:
+        return None
+
+    rows = len(str1) + 1
+    cols = len(str2) + 1
+    too_far = max_distance + 1  # every value over max_distance is stored as this
+
+    # two rows, reused; cells outside the band hold too_far
+    prev_row = [min(c, too_far) for c in range(cols)]
+    row = [too_far] * cols
+
+    for r in range(1, rows):
+        first = max(1, r - max_distance)
+        last = min(cols - 1, r + max_distance)
+        row[first-1] = r if first == 1 else too_far
+        row_min = row[first-1]
+        s1 = str1[r-1]
+        for c in range(first, last + 1):
+            modify = prev_row[c-1]
+            if s1 == str2[c-1]:
+                value = modify
+            else:
+                value = 1 + min(prev_row[c], row[c-1], modify)
+                if value > too_far:
+                    value = too_far
+            row[c] = value
+            if value < row_min:
+                row_min = value
+        if last + 1 < cols:
+            row[last+1] = too_far
+
+        if row_min > max_distance:  # no path can get back under the limit
+            return None
+        prev_row, row = row, prev_row
+
+    distance = prev_row[-1]
+    return distance if distance <= max_distance else None
+
+
+def _run_chunk(fn, pairs):
+    """Apply fn to every pair in a chunk. Runs inside a worker process."""
+    return [fn(str1, str2) for str1, str2 in pairs]
+
+
+def _batch(fn, pairs, chunk_size, max_workers):
+    """Stream fn(str1, str2) for every pair, in order, using a process pool.
+
+    Pairs are read a window at a time, so any iterable (even an endless one)
+    works. Identical pairs inside a window are only computed once."""
+    if chunk_size < 1:
+        raise ValueError('chunk_size must be at least 1')
+    if max_workers is None:
+        max_workers = cpu_count() or 1
+    # enough work to keep every worker busy for two chunks
+    window_size = chunk_size * max_workers * 2
+
+    pairs = iter(pairs)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        while True:
+            window = [tuple(pair) for pair in islice(pairs, window_size)]
+            if not window:
+                return
+
+            # dict keeps the first-seen order of the unique pairs
+            unique_pairs = list(dict.fromkeys(window))
+            chunks = [unique_pairs[i:i + chunk_size]
+                      for i in range(0, len(unique_pairs), chunk_size)]
+
+            results = {}
+            chunk_results = executor.map(_run_chunk, repeat(fn), chunks)
+            for chunk, chunk_result in zip(chunks, chunk_results):
+                results.update(zip(chunk, chunk_result))
+
+            for pair in window:
+                yield results[pair]
+
+
+def batch_edit_distance(pairs, chunk_size=1000, max_workers=None):
+    """Compute the Edit Distance of many (str1, str2) pairs across processes.
+
+    Returns a generator of the distances, in the same order as `pairs`.
+
+    Parameters:
+    pairs (iterable): The (str1, str2) pairs to compare.
+    chunk_size (int): How many pairs each worker process gets at a time.
+    max_workers (int): The number of worker processes. Defaults to one per CPU.
+    """
+    return _batch(edit_distance_bitparallel, pairs, chunk_size, max_workers)
+
+
+def batch_lcs(pairs, chunk_size=1000, max_workers=None):
+    """Determine the LCS length of many (strA, strB) pairs across processes.
+
+    Returns a generator of the lengths, in the same order as `pairs`.
+
+    Parameters:
+    pairs (iterable): The (strA, strB) pairs to compare.
+    chunk_size (int): How many pairs each worker process gets at a time.
+    max_workers (int): The number of worker processes. Defaults to one per CPU.
+    """
+    return _batch(lcs_bitparallel, pairs, chunk_size, max_workers)
+
+
+class BKTree:
+    """An index over a list of words for finding the words closest to a query
+    by Edit Distance.
+
+    Every child of a node is stored under its distance to that node. Since
+    Edit Distance obeys the triangle inequality, a search with radius k only
+    has to visit children whose stored distance is within k of the query's
+    distance to their parent, so most words are never compared at all.
+    """
+
+    def __init__(self, words=(), distance=edit_distance_bitparallel):
+        self.distance = distance
+        self.root = None  # a node is [word, {distance: child node}]
+        self.size = 0
+        self.distance_calls = 0  # how many distances have been computed
+        for word in words:
+            self.add(word)
+
+    def __len__(self):
+        return self.size
+
+    def add(self, word):
+        """Add a word to the tree. Words that are already there are skipped."""
+        if self.root is None:
+            self.root = [word, {}]
+            self.size = 1
+            return
+
+        node = self.root
+        while True:
+            node_word, children = node
+            dist = self.distance(word, node_word)
+            if dist == 0:
+                return  # already in the tree
+            if dist not in children:
+                children[dist] = [word, {}]
+                self.size += 1
+                return
+            node = children[dist]
+
+    def search(self, query, max_distance):
+        """Return a sorted list of (distance, word) for every word within
+        max_distance of the query."""
+        found = []
+        if self.root is None:
+            return found
+
+        stack = [self.root]
+        while stack:
+            word, children = stack.pop()
+            dist = self.distance(query, word)
+            self.distance_calls += 1
+            if dist <= max_distance:
+                found.append((dist, word))
+            for child_dist, child in children.items():
+                if dist - max_distance <= child_dist <= dist + max_distance:
+                    stack.append(child)
+
+        return sorted(found)
+
+    def nearest(self, query, n=1):
+        """Return a sorted list of (distance, word) for the n words closest to
+        the query."""
+        if self.root is None or n < 1:
+            return []
+
+        best = []  # max-heap of (-distance, word) holding the n closest so far
+        # each entry is (node, lowest distance any word under it could have)
+        stack = [(self.root, 0)]
+        while stack:
+            node, lower_bound = stack.pop()
+            if len(best) == n and lower_bound > -best[0][0]:
+                continue  # the limit went down since this node was added
+
+            word, children = node
+            dist = self.distance(query, word)
+            self.distance_calls += 1
+            if len(best) < n:
+                heappush(best, (-dist, word))
+            elif dist < -best[0][0]:
+                heappushpop(best, (-dist, word))
+
+            radius = -best[0][0] if len(best) == n else float('inf')
+            for child_dist, child in children.items():
+                child_bound = abs(child_dist - dist)
+                if child_bound <= radius:
+                    stack.append((child, child_bound))
+
+        return sorted((-neg_dist, word) for neg_dist, word in best)
@@ -1,6 +1,55 @@
-from challenges import lcs, lcs_dp, knapsack, knapsack_dp, edit_distance, edit_distance_dp
+from challenges import (Memoize, lcs, lcs_dp, lcs_hirschberg, lcs_bitparallel,
+                        knapsack, knapsack_memoized, knapsack_dp,
+                        edit_distance, edit_distance_dp, edit_distance_script,
+                        edit_distance_bitparallel, batch_edit_distance, batch_lcs,
+                        BKTree)
+import tracemalloc
 import unittest
 
+class MemoizeTests(unittest.TestCase):
+
+    def test_memoize_stats_and_clear(self):
+        """Test that repeated calls are served from the memo."""
+        calls = []
+
+        @Memoize
+        def square(n):
+            calls.append(n)
+            return n * n
+
+        self.assertEqual(square(3), 9)
+        self.assertEqual(square(3), 9)
+        self.assertEqual(calls, [3])
+        self.assertEqual(square.stats(), {'hits': 1, 'misses': 1, 'size': 1})
+
+        square.clear()
+        self.assertEqual(square(3), 9)
+        self.assertEqual(calls, [3, 3])
+
+    def test_memoize_max_size(self):
+        """Test that the least recently used result is evicted."""
+        @Memoize(max_size=2)
+        def double(n):
+            return 2 * n
+
+        double(1)
+        double(2)
+        double(1)
+        double(3)  # evicts 2
+        self.assertEqual(double.stats()['size'], 2)
+        double(2)
+        self.assertEqual(double.stats(), {'hits': 1, 'misses': 4, 'size': 2})
+
+    def test_memoize_key(self):
+        """Test memoizing on a compact key instead of the whole arguments."""
+        @Memoize(key=lambda text, n: n)
+        def prefix_upper(text, n):
+            return text[:n].upper()
+
+        self.assertEqual(prefix_upper('abcdef', 3), 'ABC')
+        self.assertEqual(prefix_upper('abcdef', 3), 'ABC')
+        self.assertEqual(prefix_upper.stats()['hits'], 1)
+
 class LongestCommonSubsequenceTests(unittest.TestCase):
     str1 = 'abcdef'
     str2 = 'zayxefbcd'
@@ -12,10 +61,51 @@ class LongestCommonSubsequenceTests(unittest.TestCase):
         self.assertEqual(lcs(self.str1, self.str2), 4)
         self.assertEqual(lcs(self.str3, self.str4), 35)
 
+    def test_lcs_memoized_long_strings(self):
+        """Test that long inputs don't hit the recursion limit."""
+        long_str = self.str3 * 500
+        self.assertEqual(lcs(long_str, long_str), len(long_str))
+        self.assertEqual(lcs(long_str, long_str[1:]), len(long_str) - 1)
+
+    def test_memo_grows_with_cells_computed(self):
+        """Matching strings only fill the diagonal, so no full table is made."""
+        same = 'abcdefghij' * 300
+        tracemalloc.start()
+        try:
+            self.assertEqual(lcs(same, same), len(same))
+            self.assertEqual(edit_distance(same, same), 0)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        self.assertLess(peak, 10 * 1024 * 1024)
+
     def test_lcs_dp(self):
         """Test the bottom-up, dynamic programming version of LCS."""
         self.assertEqual(lcs_dp(self.str1, self.str2), 4)
         self.assertEqual(lcs_dp(self.str3, self.str4), 35)
+        self.assertEqual(lcs_dp(self.str2, self.str1), 4)
+        self.assertEqual(lcs_dp('', self.str1), 0)
+
+    def test_lcs_hirschberg(self):
+        """Test that Hirschberg's algorithm finds a real common subsequence."""
+        for strA, strB, length in [(self.str1, self.str2, 4),
+                                   (self.str3, self.str4, 35),
+                                   ('', 'abc', 0)]:
+            subsequence, matches = lcs_hirschberg(strA, strB)
+            self.assertEqual(len(subsequence), length)
+            self.assertEqual(len(matches), length)
+            for (i, j), char in zip(matches, subsequence):
+                self.assertEqual(strA[i], char)
+                self.assertEqual(strB[j], char)
+            # both sets of indices must be strictly increasing
+            self.assertEqual(sorted(set(i for i, j in matches)), [i for i, j in matches])
+            self.assertEqual(sorted(set(j for i, j in matches)), [j for i, j in matches])
+
+    def test_lcs_bitparallel(self):
+        """Test the bit-parallel version of LCS."""
+        self.assertEqual(lcs_bitparallel(self.str1, self.str2), 4)
+        self.assertEqual(lcs_bitparallel(self.str3, self.str4), 35)
+        self.assertEqual(lcs_bitparallel(self.str1, ''), 0)
 
 class KnapsackTests(unittest.TestCase):
     items1 = [
@@ -38,11 +128,41 @@ class KnapsackTests(unittest.TestCase):
         self.assertEqual(knapsack(self.items1, 50), 230)
         self.assertEqual(knapsack(self.items2, 8), 8)
 
+    def test_knapsack_memoized(self):
+        """Test the top-down, explicit stack version of Knapsack."""
+        self.assertEqual(knapsack_memoized(self.items1, 50), 230)
+        self.assertEqual(knapsack_memoized(self.items2, 8), 8)
+        self.assertEqual(knapsack_memoized([], 8), 0)
+        # an item that weighs nothing still fits in a full knapsack
+        self.assertEqual(knapsack_memoized([('0', 0, 8)], 0), 8)
+
+        # far more items than the recursion limit allows
+        many_items = [(str(i), 1000, 1) for i in range(3000)]
+        self.assertEqual(knapsack_memoized(many_items, 5500), 5)
+
     def test_knapsack_dp(self):
         """Test the bottom-up version of Knapsack."""
         # self.assertEqual(knapsack_dp(self.items1, 50), 230)
         self.assertEqual(knapsack_dp(self.items2, 8), 8)
 
+    def test_knapsack_dp_values(self):
+        """Float and very large values give the same answers as plain Python."""
+        self.assertEqual(knapsack_dp([('a', 2, 2.5), ('b', 3, 1.5)], 5), 4.0)
+        self.assertEqual(knapsack_dp([('a', 2, 2.5), ('b', 3, 1.5)], 5, return_items=True),
+                         (4.0, [('a', 2, 2.5), ('b', 3, 1.5)]))
+        big = 2 ** 70
+        self.assertEqual(knapsack_dp([('a', 1, big), ('b', 1, big + 1)], 2), 2 * big + 1)
+
+    def test_knapsack_dp_items(self):
+        """Test that the bottom-up version can return the chosen items."""
+        value, chosen = knapsack_dp(self.items1, 50, return_items=True)
+        self.assertEqual(value, 230)
+        self.assertEqual([name for name, weight, value in chosen],
+                         ['boots', 'tent', 'first aid'])
+        self.assertEqual(knapsack_dp(self.items2, 8, return_items=True),
+                         (8, [('B', 3, 2), ('D', 5, 6)]))
+        self.assertEqual(knapsack_dp(self.items2, 1, return_items=True), (0, []))
+
 
 class EditDistanceTests(unittest.TestCase):
 
@@ -51,11 +171,89 @@ class EditDistanceTests(unittest.TestCase):
         self.assertEqual(edit_distance('saturday', 'sunday'), 3)
         self.assertEqual(edit_distance('intention', 'execution'), 5)
 
+    def test_edit_distance_memoized_long_strings(self):
+        """Test that long inputs don't hit the recursion limit."""
+        long_str = 'intention' * 5000
+        self.assertEqual(edit_distance(long_str, long_str), 0)
+        self.assertEqual(edit_distance('x' + long_str[1:], long_str), 1)
+
     def test_edit_distance_dp(self):
         """Test the bottom-up version of Edit Distance."""
         self.assertEqual(edit_distance_dp('saturday', 'sunday'), 3)
         self.assertEqual(edit_distance_dp('intention', 'execution'), 5)
 
+    def test_edit_distance_dp_max_distance(self):
+        """Test the banded Edit Distance with an upper limit."""
+        self.assertEqual(edit_distance_dp('saturday', 'sunday', max_distance=3), 3)
+        self.assertIsNone(edit_distance_dp('saturday', 'sunday', max_distance=2))
+        self.assertEqual(edit_distance_dp('intention', 'execution', max_distance=9), 5)
+        self.assertIsNone(edit_distance_dp('abc', 'abcdefg', max_distance=3))
+        self.assertEqual(edit_distance_dp('same', 'same', max_distance=0), 0)
+
+    def test_edit_distance_script(self):
+        """Test that the edit script turns one string into the other."""
+        script = list(edit_distance_script('saturday', 'sunday'))
+        edits = [op for op, i, j in script if op != 'match']
+        self.assertEqual(len(edits), 3)
+        self.assertEqual(sorted(edits), ['delete', 'delete', 'substitute'])
+
+        result = []
+        for op, i, j in edit_distance_script('intention', 'execution'):
+            if op != 'delete':
+                result.append('execution'[j])
+        self.assertEqual(''.join(result), 'execution')
+        self.assertEqual(list(edit_distance_script('', 'ab')),
+                         [('insert', None, 0), ('insert', None, 1)])
+
+    def test_edit_distance_bitparallel(self):
+        """Test the bit-parallel version of Edit Distance."""
+        self.assertEqual(edit_distance_bitparallel('saturday', 'sunday'), 3)
+        self.assertEqual(edit_distance_bitparallel('intention', 'execution'), 5)
+        self.assertEqual(edit_distance_bitparallel('', 'abc'), 3)
+        str1 = 'taagctaggaccgtcaccttgcactgcgcatcctcgaacgacatcccaatagaacgttcc'
+        str2 = 'gcgctacaaggtggaaatctaaggagttaacgcaaggagtctgcttataaacgcactgat'
+        self.assertEqual(edit_distance_bitparallel(str1, str2),
+                         edit_distance_dp(str1, str2))
+
+
+class BatchTests(unittest.TestCase):
+    pairs = [
+        ('saturday', 'sunday'),
+        ('intention', 'execution'),
+        ('abcdef', 'zayxefbcd'),
+        ('saturday', 'sunday'),
+        ('', 'abc'),
+    ]
+
+    def test_batch_edit_distance(self):
+        """Test that batch results come back in the order of the pairs."""
+        distances = batch_edit_distance(self.pairs, chunk_size=2, max_workers=2)
+        self.assertEqual(list(distances), [3, 5, 7, 3, 3])
+
+    def test_batch_lcs(self):
+        lengths = batch_lcs(iter(self.pairs), chunk_size=1, max_workers=2)
+        self.assertEqual(list(lengths), [lcs_dp(a, b) for a, b in self.pairs])
+
+
+class BKTreeTests(unittest.TestCase):
+    words = ['book', 'books', 'cake', 'boo', 'boon', 'cook', 'cape', 'cart', 'book']
+
+    def test_bk_tree_search(self):
+        """Test finding every word within a distance of the query."""
+        tree = BKTree(self.words)
+        self.assertEqual(len(tree), 8)
+        self.assertEqual(tree.search('book', 1),
+                         [(0, 'book'), (1, 'boo'), (1, 'books'), (1, 'boon'), (1, 'cook')])
+        self.assertEqual(tree.search('xyz', 1), [])
+
+    def test_bk_tree_nearest(self):
+        """Test finding the n closest words to the query."""
+        tree = BKTree(self.words)
+        self.assertEqual(tree.nearest('cap', 1), [(1, 'cape')])
+        # 'cake' and 'cart' are tied for second place
+        self.assertEqual([dist for dist, word in tree.nearest('cap', 3)], [1, 2, 2])
+        self.assertEqual(BKTree().nearest('cap', 2), [])
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,180 @@
+from array import array
+from collections import deque
+from random import Random
+
+try:
+    import numpy as np
+except ImportError:  # fall back to plain lists
+    np = None
+
+
+def to_csr(graph):
+    """
+    Convert a graph's adjacency to CSR arrays.
+
+    Returns:
+    tuple: (ids, offsets, targets). The neighbors of the vertex with id ids[i]
+    are targets[offsets[i]:offsets[i + 1]], given as positions in ids.
+    """
+    vertices = graph.get_vertices()
+    ids = [vertex.get_id() for vertex in vertices]
+    index_of = {vertex_id: i for i, vertex_id in enumerate(ids)}
+
+    offsets = array('q', [0])
+    targets = array('q')
+    for vertex in vertices:
+        targets.extend(index_of[neighbor.get_id()] for neighbor in vertex.get_neighbors())
+        offsets.append(len(targets))
+    return ids, offsets, targets
+
+
+def _teleport_vector(ids, personalization):
+    """Return the teleport probabilities as a list, from seed ids or a dict of weights."""
+    if personalization is None:
+        return [1.0 / len(ids)] * len(ids)
+
+    if not isinstance(personalization, dict):
+        personalization = {vertex_id: 1.0 for vertex_id in personalization}
+    total = float(sum(personalization.values()))
+    if total <= 0:
+        raise ValueError("The personalization weights must add up to more than 0")
+    index_of = {vertex_id: i for i, vertex_id in enumerate(ids)}
+    teleport = [0.0] * len(ids)
+    for vertex_id, weight in personalization.items():
+        if vertex_id not in index_of:
+            raise KeyError("The vertex is not in the graph!")
+        teleport[index_of[vertex_id]] = weight / total
+    return teleport
+
+
+def pagerank(graph, damping=0.85, tolerance=1e-6, max_iterations=100, personalization=None):
+    """
+    Compute PageRank scores by power iteration.
+
+    Parameters:
+    graph (Graph): The graph to score.
+    damping (float): The chance of following an edge rather than teleporting.
+    tolerance (float): Stop once the scores change by less than this in total.
+    max_iterations (integer): Stop after this many iterations regardless.
+    personalization (iterable or dict): For personalized PageRank, the seed
+        vertex ids to teleport to (equally), or a dict of id -> weight.
+
+    Returns:
+    dict: vertex id -> score. The scores add up to 1. Vertices without
+    outgoing edges (dangling vertices) spread their score by the teleport
+    probabilities.
+    """
+    ids, offsets, targets = to_csr(graph)
+    num_vertices = len(ids)
+    if num_vertices == 0:
+        return {}
+    teleport = _teleport_vector(ids, personalization)
+
+    if np is not None:
+        scores = _pagerank_numpy(offsets, targets, teleport, damping, tolerance, max_iterations)
+    else:
+        scores = _pagerank_lists(offsets, targets, teleport, damping, tolerance, max_iterations)
+    return dict(zip(ids, scores))
+
+
+def _pagerank_numpy(offsets, targets, teleport, damping, tolerance, max_iterations):
+    offsets = np.frombuffer(offsets, dtype=np.int64)
+    targets = np.frombuffer(targets, dtype=np.int64)
+    teleport = np.array(teleport)
+    num_vertices = len(teleport)
+
+    out_degree = np.diff(offsets)
+    dangling = out_degree == 0
+    # the vertex each edge starts from, to spread scores along the edges
+    sources = np.repeat(np.arange(num_vertices), out_degree)
+    safe_degree = np.where(dangling, 1, out_degree)
+
+    scores = teleport.copy()
+    for _ in range(max_iterations):
+        share = scores / safe_degree
+        spread = np.bincount(targets, weights=share[sources], minlength=num_vertices)
+        dangling_total = scores[dangling].sum()
+        new_scores = damping * (spread + dangling_total * teleport) + (1 - damping) * teleport
+        change = np.abs(new_scores - scores).sum()
+        scores = new_scores
+        if change < tolerance:
+            break
+    return scores.tolist()
+
+
+def _pagerank_lists(offsets, targets, teleport, damping, tolerance, max_iterations):
+    num_vertices = len(teleport)
+    scores = list(teleport)
+    for _ in range(max_iterations):
+        spread = [0.0] * num_vertices
+        dangling_total = 0.0
+        for u in range(num_vertices):
+            start, end = offsets[u], offsets[u + 1]
+            if start == end:
+                dangling_total += scores[u]
+                continue
+            share = scores[u] / (end - start)
+            for i in range(start, end):
+                spread[targets[i]] += share
+
+        new_scores = [damping * (spread[v] + dangling_total * teleport[v])
+                      + (1 - damping) * teleport[v] for v in range(num_vertices)]
+        change = sum(abs(new - old) for new, old in zip(new_scores, scores))
+        scores = new_scores
+        if change < tolerance:
+            break
+    return scores
+
+
+def degree_centrality(graph):
+    """
+    Return a dict of vertex id -> out-degree divided by (number of vertices - 1).
+    """
+    ids, offsets, targets = to_csr(graph)
+    scale = 1.0 / (len(ids) - 1) if len(ids) > 1 else 1.0
+    return {vertex_id: (offsets[i + 1] - offsets[i]) * scale
+            for i, vertex_id in enumerate(ids)}
+
+
+def closeness_centrality(graph, samples=None, seed=None):
+    """
+    Estimate closeness centrality (1 / average distance) for every vertex.
+
+    BFS is run from `samples` randomly chosen pivot vertices (from every vertex
+    if samples is None, which gives the exact value). A vertex's average
+    distance is estimated from its distances to the pivots that reach it. In a
+    directed graph this measures how close the vertex is from the others.
+
+    Parameters:
+    graph (Graph): The graph to score.
+    samples (integer): How many pivot vertices to run BFS from.
+    seed (integer): Seed for choosing the pivots, to get repeatable results.
+
+    Returns:
+    dict: vertex id -> closeness, 0 for vertices no other pivot reaches.
+    """
+    ids, offsets, targets = to_csr(graph)
+    num_vertices = len(ids)
+    pivots = range(num_vertices)
+    if samples is not None and samples < num_vertices:
+        pivots = Random(seed).sample(range(num_vertices), samples)
+
+    total_distance = [0] * num_vertices
+    times_reached = [0] * num_vertices
+    for pivot in pivots:
+        distances = [-1] * num_vertices
+        distances[pivot] = 0
+        queue = deque([pivot])
+        while queue:
+            u = queue.popleft()
+            next_distance = distances[u] + 1
+            for i in range(offsets[u], offsets[u + 1]):
+                v = targets[i]
+                if distances[v] == -1:
+                    distances[v] = next_distance
+                    total_distance[v] += next_distance
+                    times_reached[v] += 1
+                    queue.append(v)
+
+    return {vertex_id: (times_reached[i] / total_distance[i] if total_distance[i] else 0.0)
+            for i, vertex_id in enumerate(ids)}
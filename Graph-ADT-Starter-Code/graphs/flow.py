@@ -0,0 +1,114 @@
+from collections import deque
+
+
+class FlowNetwork:
+    """ FlowNetwork Class
+    A residual graph for computing maximum flows with Dinic's algorithm.
+
+    Edges live in flat parallel lists: edge e goes to `heads[e]` with
+    `capacities[e]` of room left, and edge e ^ 1 is its reverse edge in the
+    residual graph. `edges_out[u]` lists the edge numbers leaving vertex u.
+    """
+    def __init__(self, num_vertices):
+        """
+        Initialize a network with no edges.
+
+        Parameters:
+        num_vertices (integer): The vertices are numbered 0 to num_vertices - 1.
+        """
+        self.num_vertices = num_vertices
+        self.heads = []
+        self.capacities = []
+        self.original = [] # the capacity each edge was added with
+        self.edges_out = [[] for _ in range(num_vertices)]
+
+    def add_edge(self, u, v, capacity):
+        """Add an edge from u to v, and its reverse edge with no capacity."""
+        self.edges_out[u].append(len(self.heads))
+        self.heads.append(v)
+        self.capacities.append(capacity)
+        self.original.append(capacity)
+
+        self.edges_out[v].append(len(self.heads))
+        self.heads.append(u)
+        self.capacities.append(0)
+        self.original.append(0)
+
+    def __levels(self, source):
+        """BFS over edges with room left. Returns each vertex's distance, or -1."""
+        levels = [-1] * self.num_vertices
+        levels[source] = 0
+        queue = deque([source])
+        heads, capacities, edges_out = self.heads, self.capacities, self.edges_out
+        while queue:
+            u = queue.popleft()
+            for e in edges_out[u]:
+                v = heads[e]
+                if capacities[e] > 0 and levels[v] == -1:
+                    levels[v] = levels[u] + 1
+                    queue.append(v)
+        return levels
+
+    def __blocking_flow(self, source, sink, levels):
+        """
+        Push flow along level-increasing paths until none are left. `next_edge`
+        remembers, for each vertex, the first edge that might still be useful,
+        so each edge is given up on at most once per phase.
+        """
+        heads, capacities, edges_out = self.heads, self.capacities, self.edges_out
+        next_edge = [0] * self.num_vertices
+        total = 0
+        path = [] # edges from the source to u
+        u = source
+
+        while True:
+            if u == sink:
+                pushed = min(capacities[e] for e in path)
+                for e in path:
+                    capacities[e] -= pushed
+                    capacities[e ^ 1] += pushed
+                total += pushed
+                path = []
+                u = source
+                continue
+
+            out = edges_out[u]
+            i = next_edge[u]
+            while i < len(out):
+                e = out[i]
+                if capacities[e] > 0 and levels[heads[e]] == levels[u] + 1:
+                    break
+                i += 1
+            next_edge[u] = i
+
+            if i < len(out):
+                path.append(out[i])
+                u = heads[out[i]]
+            elif u == source:
+                return total
+            else:
+                # dead end: step back and skip the edge that led here
+                levels[u] = -1
+                e = path.pop()
+                u = heads[e ^ 1]
+                next_edge[u] += 1
+
+    def max_flow(self, source, sink):
+        """Return the value of a maximum flow from source to sink."""
+        if source == sink:
+            raise ValueError("The source and sink must be different vertices")
+        total = 0
+        while True:
+            levels = self.__levels(source)
+            if levels[sink] == -1:
+                return total
+            total += self.__blocking_flow(source, sink, levels)
+
+    def flow_on(self, e):
+        """Return how much flow goes through edge e."""
+        return self.original[e] - self.capacities[e]
+
+    def reachable_from(self, source):
+        """Return the set of vertices reachable from source in the residual graph."""
+        levels = self.__levels(source)
+        return {v for v in range(self.num_vertices) if levels[v] != -1}
@@ -1,6 +1,22 @@
 from collections import deque
 from random import choice
 
+from graphs.query_cache import QueryCacheMixin, cached_query
+from graphs.snapshot import GraphSnapshot
+
+
+def _as_rows(items):
+    """
+    Return `items` in a form that can be iterated over cheaply.
+
+    NumPy arrays are converted with a single `tolist()` call, so that their
+    rows come back as plain Python values instead of NumPy scalars.
+    """
+    if hasattr(items, 'tolist'):
+        return items.tolist()
+    return items
+
+
 class Vertex(object):
     """
     Defines a single vertex and its neighbors.
@@ -25,6 +41,18 @@ class Vertex(object):
         """
         self.__neighbors_dict[vertex_obj.__id] = vertex_obj
 
+    def remove_neighbor(self, vertex_id):
+        """
+        Remove the neighbor with the given id from the neighbors dictionary.
+
+        Parameters:
+        vertex_id (string): The id of the neighbor to remove.
+
+        Returns:
+        boolean: True if the vertex was a neighbor, False otherwise.
+        """
+        return self.__neighbors_dict.pop(vertex_id, None) is not None
+
     def __str__(self):
         """Output the list of neighbors of this vertex."""
         neighbor_ids = list(self.neighbors_dict.keys())
@@ -43,7 +71,7 @@ class Vertex(object):
         return self.__id
 
 
-class Graph:
+class Graph(QueryCacheMixin):
     """ Graph Class
     Represents a directed or undirected graph.
     """
@@ -56,10 +84,20 @@ class Graph:
         """
         self.__vertex_dict = {} # id -> object
         self.__is_directed = is_directed
+        # for directed graphs, id -> set of ids with an edge into that vertex,
+        # so that removing a vertex doesn't need to scan the whole graph
+        self.__incoming_dict = {}
+        # ids whose neighbors changed since the last published snapshot
+        self.__dirty_ids = set()
+        self.__snapshot = GraphSnapshot({}, is_directed, 0)
+        # bumped by every change to the graph, to invalidate cached results
+        self.__version = 0
+        self._init_query_caches()
 
     def add_vertex(self, vertex_id):
         """
         Add a new vertex object to the graph with the given key and return the vertex.
+        If the vertex already exists, the existing vertex (and its edges) is kept.
         
         Parameters:
         vertex_id (string): The unique identifier for the new vertex.
@@ -67,9 +105,40 @@ class Graph:
         Returns:
         Vertex: The new vertex object.
         """
+        if vertex_id in self.__vertex_dict:
+            return self.__vertex_dict[vertex_id]
         self.__vertex_dict[vertex_id] = Vertex(vertex_id)
+        if self.__is_directed:
+            self.__incoming_dict[vertex_id] = set()
+        self.__dirty_ids.add(vertex_id)
+        self.__version += 1
         return self.__vertex_dict[vertex_id]
 
+    def add_vertices(self, vertex_ids):
+        """
+        Add many vertices to the graph at once. Ids that are already in the
+        graph keep their existing vertex.
+
+        Parameters:
+        vertex_ids (iterable<string>): The ids of the new vertices. A NumPy
+            array is accepted as well.
+
+        Returns:
+        list<Vertex>: The vertex objects for the given ids, in order.
+        """
+        vertex_dict = self.__vertex_dict
+        vertices = []
+        for vertex_id in _as_rows(vertex_ids):
+            vertex_obj = vertex_dict.get(vertex_id)
+            if vertex_obj is None:
+                vertex_obj = vertex_dict[vertex_id] = Vertex(vertex_id)
+                if self.__is_directed:
+                    self.__incoming_dict[vertex_id] = set()
+                self.__dirty_ids.add(vertex_id)
+            vertices.append(vertex_obj)
+        self.__version += 1
+        return vertices
+
     def get_vertex(self, vertex_id):
         """Return the vertex if it exists."""
         if vertex_id not in self.__vertex_dict:
@@ -88,9 +157,145 @@ class Graph:
         """
         v2 = self.get_vertex(vertex_id2)
         self.__vertex_dict[vertex_id1].add_neighbor(v2)
+        self.__dirty_ids.add(vertex_id1)
+        self.__version += 1
         if not self.__is_directed:
             self.__vertex_dict[vertex_id2].add_neighbor(self.__vertex_dict[vertex_id1])
+            self.__dirty_ids.add(vertex_id2)
+        else:
+            self.__incoming_dict[vertex_id2].add(vertex_id1)
+
+    def add_edges(self, edges):
+        """
+        Add many edges to the graph at once. Every endpoint is checked before
+        any edge is added, so a bad edge leaves the graph unchanged.
+
+        Parameters:
+        edges (iterable<tuple>): Pairs of (vertex_id1, vertex_id2). A NumPy
+            array with one edge per row is accepted as well.
+        """
+        vertex_dict = self.__vertex_dict
+        pairs = []
+        for edge in _as_rows(edges):
+            vertex_id1, vertex_id2 = edge
+            vertex_obj1 = vertex_dict.get(vertex_id1)
+            vertex_obj2 = vertex_dict.get(vertex_id2)
+            if vertex_obj1 is None or vertex_obj2 is None:
+                raise KeyError("One or both vertices are not in the graph!")
+            pairs.append((vertex_obj1, vertex_obj2))
+
+        self.__version += 1
+        dirty_ids = self.__dirty_ids
+        for vertex_obj1, vertex_obj2 in pairs:
+            vertex_obj1.add_neighbor(vertex_obj2)
+            dirty_ids.add(vertex_obj1.get_id())
+        if not self.__is_directed:
+            for vertex_obj1, vertex_obj2 in pairs:
+                vertex_obj2.add_neighbor(vertex_obj1)
+                dirty_ids.add(vertex_obj2.get_id())
+        else:
+            incoming_dict = self.__incoming_dict
+            for vertex_obj1, vertex_obj2 in pairs:
+                incoming_dict[vertex_obj2.get_id()].add(vertex_obj1.get_id())
+
+    def remove_edge(self, vertex_id1, vertex_id2):
+        """
+        Remove the edge from vertex `vertex_id1` to vertex `vertex_id2`. In an
+        undirected graph the mirrored edge is removed as well.
+
+        Parameters:
+        vertex_id1 (string): The unique identifier of the first vertex.
+        vertex_id2 (string): The unique identifier of the second vertex.
+        """
+        if not self.contains_id(vertex_id1) or not self.contains_id(vertex_id2):
+            raise KeyError("One or both vertices are not in the graph!")
+
+        if not self.__vertex_dict[vertex_id1].remove_neighbor(vertex_id2):
+            raise KeyError("The edge is not in the graph!")
+        self.__dirty_ids.add(vertex_id1)
+        self.__version += 1
+        if not self.__is_directed:
+            self.__vertex_dict[vertex_id2].remove_neighbor(vertex_id1)
+            self.__dirty_ids.add(vertex_id2)
+        else:
+            self.__incoming_dict[vertex_id2].discard(vertex_id1)
+
+    def remove_vertex(self, vertex_id):
+        """
+        Remove a vertex and every edge into or out of it. This costs
+        O(in-degree + out-degree) rather than a scan over every vertex.
+
+        Parameters:
+        vertex_id (string): The unique identifier of the vertex to remove.
+        """
+        if not self.contains_id(vertex_id):
+            raise KeyError("The vertex is not in the graph!")
+
+        vertex_obj = self.__vertex_dict.pop(vertex_id)
+        self.__dirty_ids.add(vertex_id)
+        self.__version += 1
+        if not self.__is_directed:
+            # every neighbor holds the mirrored edge back to this vertex
+            for neighbor in vertex_obj.get_neighbors():
+                neighbor.remove_neighbor(vertex_id)
+                self.__dirty_ids.add(neighbor.get_id())
+            return
+
+        for neighbor in vertex_obj.get_neighbors():
+            self.__incoming_dict[neighbor.get_id()].discard(vertex_id)
+        for incoming_id in self.__incoming_dict.pop(vertex_id):
+            if incoming_id != vertex_id:
+                self.__vertex_dict[incoming_id].remove_neighbor(vertex_id)
+                self.__dirty_ids.add(incoming_id)
+
+    def publish_snapshot(self):
+        """
+        Freeze the current state of the graph into a new `GraphSnapshot` and
+        make it the one returned by `get_snapshot`.
+
+        Only vertices that changed since the previous snapshot are rebuilt;
+        every other neighbor tuple is shared with the previous snapshot. The new
+        snapshot is published with a single assignment, so readers see either
+        the old snapshot or the new one, never a partial update. Call this from
+        the thread that makes changes to the graph.
+
+        Snapshots are only supported for Graph itself: WeightedGraph, the
+        views and the compact graphs raise TypeError.
+
+        Returns:
+        GraphSnapshot: The newly published snapshot.
+        """
+        previous = self.__snapshot
+        adjacency = dict(previous.get_adjacency())
+        vertex_dict = self.__vertex_dict
+        for vertex_id in self.__dirty_ids:
+            vertex_obj = vertex_dict.get(vertex_id)
+            if vertex_obj is None:
+                adjacency.pop(vertex_id, None)
+            else:
+                adjacency[vertex_id] = tuple(
+                    neighbor.get_id() for neighbor in vertex_obj.get_neighbors())
+        self.__dirty_ids = set()
+
+        self.__snapshot = GraphSnapshot(
+            adjacency, self.__is_directed, previous.get_version() + 1)
+        return self.__snapshot
+
+    def get_snapshot(self):
+        """
+        Return the most recently published snapshot. Readers can query it
+        without locking while the graph itself keeps changing.
+        """
+        return self.__snapshot
         
+    def get_version(self):
+        """Return a number that changes every time the graph is changed."""
+        return self.__version
+
+    def is_directed_graph(self):
+        """Return True if the graph is directed, and False otherwise."""
+        return self.__is_directed
+
     def get_vertices(self):
         """
         Return all vertices in the graph.
@@ -141,6 +346,7 @@ class Graph:
 
         return # everything has been processed
 
+    @cached_query
     def find_shortest_path(self, start_id, target_id):
         """
         Find and return the shortest path from start_id to target_id.
@@ -155,34 +361,9 @@ class Graph:
         if not self.contains_id(start_id) or not self.contains_id(target_id):
             raise KeyError("One or both vertices are not in the graph!")
 
-        # vertex keys we've seen before and their paths from the start vertex
-        vertex_id_to_path = {
-            start_id: [start_id] # only one thing in the path
-        }
-
-        # queue of vertices to visit next
-        queue = deque() 
-        queue.append(self.get_vertex(start_id))
-
-        # while queue is not empty
-        while queue:
-            current_vertex_obj = queue.pop() # vertex obj to visit next
-            current_vertex_id = current_vertex_obj.get_id()
-
-            neighbors = current_vertex_obj.get_neighbors()
-
-            for neighbor in neighbors:
-                if neighbor.get_id() not in vertex_id_to_path:
-                    current_path = vertex_id_to_path[current_vertex_id]
-                    # extend the path by 1 vertex
-                    next_path = current_path + [neighbor.get_id()]
-                    vertex_id_to_path[neighbor.get_id()] = next_path
-                    queue.appendleft(neighbor)
-
-        if target_id not in vertex_id_to_path: # path not found
-            return None
-
-        return vertex_id_to_path[target_id]
+        # the BFS tree from start_id is kept, so later calls with the same
+        # start vertex don't search again
+        return self.get_shortest_path_tree(start_id).get_path(target_id)
 
     def find_vertices_n_away(self, start_id, target_distance):
         """
@@ -233,10 +414,11 @@ class Graph:
                         queue.appendleft(neighbor)
         return solutions
 
+    @cached_query
     def is_bipartite(self):
         """Return True if the graph is bipartite, and False otherwise."""
 
-        start_id = choice(list(self.__vertex_dict.keys()))
+        start_id = choice([vertex.get_id() for vertex in self.get_vertices()])
 
         queue = deque()
         queue.append(self.get_vertex(start_id))
@@ -261,15 +443,15 @@ class Graph:
                         return False
         return True
     
+    @cached_query
     def get_connected_components(self):
         """
         Return a list of all connected components, with each connected component
         represented as a list of vertex ids.
         """
-        start_id = choice(list(self.__vertex_dict.keys()))
-
         # must be a list, can't be a set because random.choice does not it
-        remaining_ids = list(self.__vertex_dict.keys())
+        remaining_ids = [vertex.get_id() for vertex in self.get_vertices()]
+        start_id = choice(remaining_ids)
         remaining_ids.remove(start_id) 
 
         seen = set()
@@ -308,6 +490,102 @@ class Graph:
 
         return components
 
+    @cached_query
+    def get_strongly_connected_components(self):
+        """
+        Return a list of the strongly connected components of the graph, each
+        one a list of vertex ids. Two vertices are in the same component if
+        each can reach the other. The components come out in topological
+        order: edges between components only go from earlier to later ones.
+
+        Uses an iterative version of Tarjan's algorithm, in O(V + E) time.
+        """
+        index_of = {} # id -> order in which the DFS found it
+        lowlink = {} # id -> smallest index reachable from its DFS subtree
+        on_stack = set()
+        stack = []
+        components = []
+        counter = 0
+
+        for root in self.get_vertices():
+            root_id = root.get_id()
+            if root_id in index_of:
+                continue
+
+            index_of[root_id] = lowlink[root_id] = counter
+            counter += 1
+            stack.append(root_id)
+            on_stack.add(root_id)
+            # each entry is a vertex id and an iterator over its unvisited neighbors,
+            # standing in for one level of recursion
+            work = [(root_id, iter(root.get_neighbors()))]
+
+            while work:
+                v_id, neighbors = work[-1]
+                went_deeper = False
+                for n in neighbors:
+                    n_id = n.get_id()
+                    if n_id not in index_of:
+                        index_of[n_id] = lowlink[n_id] = counter
+                        counter += 1
+                        stack.append(n_id)
+                        on_stack.add(n_id)
+                        work.append((n_id, iter(n.get_neighbors())))
+                        went_deeper = True
+                        break
+                    elif n_id in on_stack:
+                        lowlink[v_id] = min(lowlink[v_id], index_of[n_id])
+                if went_deeper:
+                    continue
+
+                # every neighbor is done, so "return" to the parent
+                work.pop()
+                if work:
+                    parent_id = work[-1][0]
+                    lowlink[parent_id] = min(lowlink[parent_id], lowlink[v_id])
+
+                # v_id is the root of a component: pop the whole component
+                if lowlink[v_id] == index_of[v_id]:
+                    component = []
+                    while True:
+                        w_id = stack.pop()
+                        on_stack.remove(w_id)
+                        component.append(w_id)
+                        if w_id == v_id:
+                            break
+                    components.append(component)
+
+        # Tarjan finds components in reverse topological order
+        components.reverse()
+        return components
+
+    def get_condensation(self):
+        """
+        Collapse every strongly connected component into a single vertex.
+
+        Returns:
+        tuple: (components, dag), where components is the list from
+        `get_strongly_connected_components` and dag is a new directed Graph
+        (always acyclic) whose vertex i stands for components[i].
+        """
+        components = self.get_strongly_connected_components()
+        component_of = {}
+        for i, component in enumerate(components):
+            for v_id in component:
+                component_of[v_id] = i
+
+        dag = Graph(is_directed=True)
+        dag.add_vertices(range(len(components)))
+        edges = set()
+        for vertex in self.get_vertices():
+            v_comp = component_of[vertex.get_id()]
+            for n in vertex.get_neighbors():
+                n_comp = component_of[n.get_id()]
+                if n_comp != v_comp:
+                    edges.add((v_comp, n_comp))
+        dag.add_edges(sorted(edges))
+        return components, dag
+
     def find_path_dfs_iter(self, start_id, target_id):
         """
         Use DFS with a stack to find a path from start_id to target_id.
@@ -337,7 +615,7 @@ class Graph:
                         return next_path
                     paths[n_id] = next_path
                     stack.append(n)
-        return path
+        return None # path not found
 
     def dfs_traversal(self, start_id):
         """Visit each vertex, starting with start_id, in DFS order."""
@@ -377,7 +655,7 @@ class Graph:
                     dfs_cycle(n, visited, recursion_stack)
             return recursion_stack[-1]
         
-        start_id = list(self.__vertex_dict.keys())[0]
+        start_id = self.get_vertices()[0].get_id()
         start_obj = self.get_vertex(start_id)
         visited, recursion_stack = [start_id], []
         is_cycle = dfs_cycle(start_obj, visited, recursion_stack)
@@ -0,0 +1,257 @@
+from array import array
+from collections.abc import Mapping
+
+from graphs.centrality import to_csr
+from graphs.graph import Graph
+from graphs.weighted_graph import WeightedGraph
+
+
+class ViewVertex:
+    """
+    A vertex as seen through a view. It holds only its id; its neighbors are
+    looked up (and filtered) each time they are asked for.
+    """
+    def __init__(self, view, vertex_id):
+        self.view = view
+        self.id = vertex_id
+
+    def __str__(self):
+        """Output the list of neighbors of this vertex."""
+        neighbor_ids = [n_id for n_id, _ in self.view._neighbor_items(self.id)]
+        return f'{self.id} adjacent to {neighbor_ids}'
+
+    def __repr__(self):
+        """Output the list of neighbors of this vertex."""
+        return self.__str__()
+
+    def get_neighbors(self):
+        """Return the neighbors of this vertex that are in the view."""
+        view = self.view
+        return [view.vertex_class(view, n_id) for n_id, _ in view._neighbor_items(self.id)]
+
+    def get_id(self):
+        """Return the id of this vertex."""
+        return self.id
+
+
+class WeightedViewVertex(ViewVertex):
+
+    def get_neighbors_with_weights(self):
+        """Return (neighbor, weight) pairs for the neighbors in the view."""
+        view = self.view
+        return [(view.vertex_class(view, n_id), weight)
+                for n_id, weight in view._neighbor_items(self.id)]
+
+
+class _VertexMap(Mapping):
+    """A read-only id -> vertex mapping over a view, standing in for `vertex_dict`."""
+
+    def __init__(self, view):
+        self.view = view
+
+    def __getitem__(self, vertex_id):
+        if not self.view.contains_id(vertex_id):
+            raise KeyError(vertex_id)
+        return self.view.vertex_class(self.view, vertex_id)
+
+    def __iter__(self):
+        return iter(self.view._vertex_ids())
+
+    def __len__(self):
+        return sum(1 for _ in self.view._vertex_ids())
+
+    def __contains__(self, vertex_id):
+        return self.view.contains_id(vertex_id)
+
+
+class _ReadOnlyGraph:
+    """
+    The parts shared by views and compact graphs. Subclasses say which vertices
+    there are (`_vertex_ids`, `contains_id`) and what their edges are
+    (`_neighbor_items`); everything else, including the algorithms inherited
+    from Graph and WeightedGraph, works through the usual vertex methods.
+    """
+    vertex_class = ViewVertex
+
+    def _init_caches(self):
+        self._init_query_caches()
+        self.negative_weights = (None, False) # (version, whether any weight is < 0)
+
+    @property
+    def vertex_dict(self):
+        return _VertexMap(self)
+
+    @property
+    def version(self):
+        return self.get_version()
+
+    def get_vertex(self, vertex_id):
+        """Return the vertex if it exists."""
+        if not self.contains_id(vertex_id):
+            return None
+        return self.vertex_class(self, vertex_id)
+
+    def get_vertices(self):
+        """Return all the vertices in the graph"""
+        return [self.vertex_class(self, vertex_id) for vertex_id in self._vertex_ids()]
+
+    def __read_only(self, *args):
+        raise TypeError("A graph view can't be changed; change the graph it views instead")
+
+    add_vertex = add_vertices = add_edge = add_edges = __read_only
+    remove_edge = remove_vertex = __read_only
+
+    def is_directed_graph(self):
+        """Return True if the graph is directed, and False otherwise."""
+        return self.is_directed
+
+    def publish_snapshot(self):
+        """Views have no snapshots of their own; publish one from the graph they view."""
+        raise TypeError("Snapshots are only supported for Graph, not views or compact graphs")
+
+    get_snapshot = publish_snapshot
+
+    def materialize(self):
+        """
+        Copy the vertices and edges in the view into a `CompactGraph` (or
+        `CompactWeightedGraph`), which keeps the edges in CSR arrays instead of
+        vertex objects. Worth it when the view will be queried many times,
+        since the filters are not run again. The copy doesn't follow later
+        changes to the original graph.
+        """
+        ids, offsets, targets = to_csr(self)
+        if self.vertex_class is WeightedViewVertex:
+            weights = array('d', (weight for vertex_id in ids
+                                  for _, weight in self._neighbor_items(vertex_id)))
+            return CompactWeightedGraph(ids, offsets, targets, weights, self.is_directed)
+        return CompactGraph(ids, offsets, targets, self.is_directed)
+
+
+class GraphView(_ReadOnlyGraph, Graph):
+    """ GraphView Class
+    A live, read-only view of part of a Graph. The view shares the graph's
+    storage: vertices and edges are checked against the filters as they are
+    traversed, so making a view costs nothing and it always reflects the
+    graph's current edges. Graph algorithms such as `bfs_traversal`,
+    `is_bipartite` and `get_connected_components` can be run on it directly.
+    """
+    def __init__(self, graph, vertex_filter=None, edge_filter=None):
+        """
+        Parameters:
+        graph (Graph): The graph to view.
+        vertex_filter (function): Called with a vertex id; the vertex is in
+            the view if it returns True. None keeps every vertex.
+        edge_filter (function): Called with (vertex_id1, vertex_id2) for an
+            unweighted graph, or (vertex_id1, vertex_id2, weight) for a
+            weighted one; the edge is in the view if it returns True. Edges to
+            vertices outside the view are always left out.
+        """
+        self.graph = graph
+        self.vertex_filter = vertex_filter
+        self.edge_filter = edge_filter
+        self.is_directed = graph.is_directed_graph()
+        self._init_caches()
+
+    def get_version(self):
+        """Return the version of the viewed graph, so cached results follow its changes."""
+        return self.graph.get_version()
+
+    def contains_id(self, vertex_id):
+        if not self.graph.contains_id(vertex_id):
+            return False
+        return self.vertex_filter is None or self.vertex_filter(vertex_id)
+
+    def _vertex_ids(self):
+        ids = (vertex.get_id() for vertex in self.graph.get_vertices())
+        if self.vertex_filter is None:
+            return ids
+        return filter(self.vertex_filter, ids)
+
+    def _neighbor_items(self, vertex_id):
+        """Yield (neighbor id, weight) for each edge out of vertex_id that is in the view."""
+        vertex_obj = self.graph.get_vertex(vertex_id)
+        if self.vertex_class is WeightedViewVertex:
+            items = ((n.get_id(), weight) for n, weight in vertex_obj.get_neighbors_with_weights())
+        else:
+            items = ((n.get_id(), None) for n in vertex_obj.get_neighbors())
+
+        vertex_filter, edge_filter = self.vertex_filter, self.edge_filter
+        for n_id, weight in items:
+            if vertex_filter is not None and not vertex_filter(n_id):
+                continue
+            if edge_filter is not None:
+                if weight is None and not edge_filter(vertex_id, n_id):
+                    continue
+                if weight is not None and not edge_filter(vertex_id, n_id, weight):
+                    continue
+            yield n_id, weight
+
+
+class WeightedGraphView(GraphView, WeightedGraph):
+    """ WeightedGraphView Class
+    A GraphView of a WeightedGraph. Weighted algorithms such as
+    `find_shortest_path` and `minimum_spanning_tree_kruskal` see only the
+    vertices and edges that pass the filters.
+    """
+    vertex_class = WeightedViewVertex
+
+
+class CompactGraph(_ReadOnlyGraph, Graph):
+    """ CompactGraph Class
+    A read-only graph stored as CSR arrays (see `centrality.to_csr`): the
+    neighbors of the vertex ids[i] are targets[offsets[i]:offsets[i + 1]],
+    given as positions in ids. Made by `GraphView.materialize`.
+    """
+    def __init__(self, ids, offsets, targets, is_directed=True):
+        self.ids = ids
+        self.index_of = {vertex_id: i for i, vertex_id in enumerate(ids)}
+        self.offsets = offsets
+        self.targets = targets
+        self.is_directed = is_directed
+        self._init_caches()
+
+    def get_version(self):
+        return 0 # never changes
+
+    def contains_id(self, vertex_id):
+        return vertex_id in self.index_of
+
+    def _vertex_ids(self):
+        return iter(self.ids)
+
+    def _neighbor_items(self, vertex_id):
+        i = self.index_of[vertex_id]
+        ids, targets = self.ids, self.targets
+        return [(ids[targets[e]], None) for e in range(self.offsets[i], self.offsets[i + 1])]
+
+
+class CompactWeightedGraph(CompactGraph, WeightedGraph):
+    """ CompactWeightedGraph Class
+    A CompactGraph that also keeps each edge's weight, in `weights[e]`.
+    """
+    vertex_class = WeightedViewVertex
+
+    def __init__(self, ids, offsets, targets, weights, is_directed=True):
+        super().__init__(ids, offsets, targets, is_directed)
+        self.weights = weights
+
+    def _neighbor_items(self, vertex_id):
+        i = self.index_of[vertex_id]
+        ids, targets, weights = self.ids, self.targets, self.weights
+        return [(ids[targets[e]], weights[e]) for e in range(self.offsets[i], self.offsets[i + 1])]
+
+
+def graph_view(graph, vertex_filter=None, edge_filter=None):
+    """Return a GraphView, or a WeightedGraphView for a WeightedGraph. See `GraphView`."""
+    if isinstance(graph, WeightedGraph):
+        return WeightedGraphView(graph, vertex_filter, edge_filter)
+    return GraphView(graph, vertex_filter, edge_filter)
+
+
+def induced_subgraph(graph, vertex_ids):
+    """
+    Return a view of only the given vertices and the edges between them, for
+    example one connected component.
+    """
+    vertex_ids = frozenset(vertex_ids)
+    return graph_view(graph, vertex_filter=vertex_ids.__contains__)
@@ -0,0 +1,296 @@
+import json
+import os
+from collections import Counter, deque
+from multiprocessing import Pipe, Process
+from random import Random
+
+
+def partition_graph(graph, num_shards, iterations=10, balance=1.1, seed=None):
+    """
+    Split the vertices of a graph into shards, trying to keep as many edges as
+    possible inside a shard.
+
+    Vertices start out in contiguous blocks of BFS order, so neighbors tend to
+    share a shard. Then a few rounds of label propagation move each vertex to
+    the shard most of its neighbors are in, as long as that shard isn't full.
+
+    Parameters:
+    graph (Graph): The graph to split.
+    num_shards (integer): How many shards to make.
+    iterations (integer): The most label propagation rounds to run.
+    balance (float): A shard may hold up to this times the average shard size.
+    seed (integer): Seed for the order vertices are visited in.
+
+    Returns:
+    dict: vertex id -> shard number, from 0 to num_shards - 1.
+    """
+    if num_shards < 1:
+        raise ValueError("num_shards must be at least 1")
+    vertices = graph.get_vertices()
+    neighbor_ids = {vertex.get_id(): [n.get_id() for n in vertex.get_neighbors()]
+                    for vertex in vertices}
+    # treat edges as undirected when counting neighbors. Lists keep the order
+    # (so a seed gives the same result every run), sets keep the check O(1).
+    linked_ids = {vertex_id: list(ids) for vertex_id, ids in neighbor_ids.items()}
+    linked_sets = {vertex_id: set(ids) for vertex_id, ids in neighbor_ids.items()}
+    for vertex_id, ids in neighbor_ids.items():
+        for n_id in ids:
+            if vertex_id not in linked_sets[n_id]:
+                linked_sets[n_id].add(vertex_id)
+                linked_ids[n_id].append(vertex_id)
+    del linked_sets
+
+    # BFS order over every component
+    order = []
+    seen = set()
+    for vertex_id in neighbor_ids:
+        if vertex_id in seen:
+            continue
+        seen.add(vertex_id)
+        queue = deque([vertex_id])
+        while queue:
+            current_id = queue.popleft()
+            order.append(current_id)
+            for n_id in linked_ids[current_id]:
+                if n_id not in seen:
+                    seen.add(n_id)
+                    queue.append(n_id)
+
+    block_size = max(1, -(-len(order) // num_shards)) # ceiling division
+    assignment = {vertex_id: min(i // block_size, num_shards - 1)
+                  for i, vertex_id in enumerate(order)}
+    sizes = Counter(assignment.values())
+    capacity = max(block_size, int(block_size * balance))
+
+    random = Random(seed)
+    for _ in range(iterations):
+        random.shuffle(order)
+        moved = 0
+        for vertex_id in order:
+            if not linked_ids[vertex_id]:
+                continue
+            current = assignment[vertex_id]
+            counts = Counter(assignment[n_id] for n_id in linked_ids[vertex_id])
+            best = max(counts, key=lambda shard: (counts[shard], shard == current))
+            if best != current and counts[best] > counts[current] and sizes[best] < capacity:
+                assignment[vertex_id] = best
+                sizes[current] -= 1
+                sizes[best] += 1
+                moved += 1
+        if moved == 0:
+            break
+    return assignment
+
+
+class Shard:
+    """ Shard Class
+    One piece of a partitioned graph: the vertices it owns with their outgoing
+    edges, plus a ghost table giving the owning shard of every neighbor that
+    lives in another shard.
+    """
+    def __init__(self, shard_id, adjacency, ghosts):
+        """
+        Parameters:
+        shard_id (integer): The number of this shard.
+        adjacency (dict): owned vertex id -> list of neighbor ids.
+        ghosts (dict): boundary neighbor id -> the shard that owns it.
+        """
+        self.shard_id = shard_id
+        self.adjacency = adjacency
+        self.ghosts = ghosts
+
+    def owner(self, vertex_id):
+        """Return the number of the shard that owns vertex_id."""
+        if vertex_id in self.adjacency:
+            return self.shard_id
+        return self.ghosts[vertex_id]
+
+
+def make_shards(graph, assignment):
+    """Return a list of Shards for a graph, split by a vertex id -> shard dict."""
+    num_shards = max(assignment.values()) + 1 if assignment else 0
+    shards = [Shard(i, {}, {}) for i in range(num_shards)]
+    for vertex in graph.get_vertices():
+        vertex_id = vertex.get_id()
+        shard = shards[assignment[vertex_id]]
+        shard.adjacency[vertex_id] = []
+        for neighbor in vertex.get_neighbors():
+            n_id = neighbor.get_id()
+            shard.adjacency[vertex_id].append(n_id)
+            if assignment[n_id] != shard.shard_id:
+                shard.ghosts[n_id] = assignment[n_id]
+    return shards
+
+
+def write_shards(graph, assignment, directory):
+    """
+    Write each shard of a graph to its own JSON file in directory.
+
+    Returns:
+    list<string>: The file paths, indexed by shard number.
+    """
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for shard in make_shards(graph, assignment):
+        path = os.path.join(directory, f'shard_{shard.shard_id}.json')
+        # pairs instead of JSON objects, so that ids that aren't strings survive
+        with open(path, 'w') as f:
+            json.dump({
+                'shard_id': shard.shard_id,
+                'adjacency': list(shard.adjacency.items()),
+                'ghosts': list(shard.ghosts.items()),
+            }, f)
+        paths.append(path)
+    return paths
+
+
+def load_shard(path):
+    """Read a Shard back from a file written by `write_shards`."""
+    with open(path) as f:
+        data = json.load(f)
+    return Shard(data['shard_id'], dict(data['adjacency']), dict(data['ghosts']))
+
+
+def _shard_worker(path, conn):
+    """
+    Serve one shard inside a worker process. Each command received on conn
+    is one superstep: apply the incoming messages to the owned vertices and
+    send back the outgoing messages, grouped by destination shard.
+    """
+    shard = load_shard(path)
+    adjacency = shard.adjacency
+    state = {}
+
+    def send_to_neighbors(outbox, vertex_id, value):
+        for n_id in adjacency[vertex_id]:
+            outbox.setdefault(shard.owner(n_id), []).append((n_id, value))
+
+    while True:
+        command, messages = conn.recv()
+        outbox = {}
+        if command == 'stop':
+            conn.close()
+            return
+        elif command == 'bfs':
+            # messages are (vertex id, distance) for one BFS level
+            if messages is None:
+                state = {}
+                messages = []
+            for vertex_id, distance in messages:
+                if vertex_id not in state:
+                    state[vertex_id] = distance
+                    send_to_neighbors(outbox, vertex_id, distance + 1)
+        elif command == 'label':
+            # messages are (vertex id, label); every vertex keeps the smallest
+            if messages is None:
+                state = {}
+                for i, vertex_id in enumerate(adjacency):
+                    state[vertex_id] = (shard.shard_id, i)
+                    send_to_neighbors(outbox, vertex_id, state[vertex_id])
+            else:
+                for vertex_id, label in messages:
+                    if label < state[vertex_id]:
+                        state[vertex_id] = label
+                        send_to_neighbors(outbox, vertex_id, label)
+        elif command == 'result':
+            conn.send(list(state.items()))
+            continue
+        conn.send(outbox)
+
+
+class ShardCoordinator:
+    """ ShardCoordinator Class
+    Runs graph algorithms across shard worker processes in bulk-synchronous
+    supersteps. In each superstep every worker handles the messages sent to
+    its vertices, then the coordinator routes the messages they produce to
+    the owning shards over pipes. An algorithm ends when no messages are left.
+
+    Use it as a context manager so the workers are always stopped:
+
+        with ShardCoordinator(paths) as coordinator:
+            distances = coordinator.bfs('A')
+    """
+    def __init__(self, shard_paths):
+        """
+        Start one worker process per shard.
+
+        Parameters:
+        shard_paths (list<string>): Shard files from `write_shards`, in order.
+        """
+        self.connections = []
+        self.processes = []
+        self.owners = {} # vertex id -> shard, for routing the first message
+        for path in shard_paths:
+            shard = load_shard(path)
+            for vertex_id in shard.adjacency:
+                self.owners[vertex_id] = shard.shard_id
+
+            parent_conn, child_conn = Pipe()
+            process = Process(target=_shard_worker, args=(path, child_conn), daemon=True)
+            process.start()
+            self.connections.append(parent_conn)
+            self.processes.append(process)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Stop every worker process."""
+        for conn in self.connections:
+            conn.send(('stop', None))
+        for process in self.processes:
+            process.join()
+        self.connections = []
+        self.processes = []
+
+    def __run(self, command, first_inboxes):
+        """Run supersteps until no messages are left, then gather every shard's state."""
+        inboxes = first_inboxes
+        while True:
+            for conn, inbox in zip(self.connections, inboxes):
+                conn.send((command, inbox))
+            next_inboxes = [[] for _ in self.connections]
+            for conn in self.connections:
+                for shard_id, messages in conn.recv().items():
+                    next_inboxes[shard_id].extend(messages)
+            if not any(next_inboxes):
+                break
+            inboxes = next_inboxes
+
+        results = {}
+        for conn in self.connections:
+            conn.send(('result', None))
+            results.update(conn.recv())
+        return results
+
+    def bfs(self, start_id):
+        """Return a dict of vertex id -> BFS distance from start_id, for every reachable vertex."""
+        if start_id not in self.owners:
+            raise KeyError("The vertex is not in the graph!")
+        # the first superstep clears every worker's state; the start vertex
+        # goes out in the second
+        inboxes = [None for _ in self.connections]
+        for conn, inbox in zip(self.connections, inboxes):
+            conn.send(('bfs', inbox))
+        for conn in self.connections:
+            conn.recv()
+
+        first = [[] for _ in self.connections]
+        first[self.owners[start_id]].append((start_id, 0))
+        return self.__run('bfs', first)
+
+    def get_connected_components(self):
+        """
+        Return a list of connected components, each a list of vertex ids, by
+        spreading the smallest label along the edges. Like
+        `Graph.get_connected_components`, edges are followed in their stored
+        direction, so use it on undirected graphs.
+        """
+        labels = self.__run('label', [None for _ in self.connections])
+        components = {}
+        for vertex_id, label in labels.items():
+            components.setdefault(label, []).append(vertex_id)
+        return list(components.values())
@@ -0,0 +1,155 @@
+from collections import OrderedDict
+from functools import wraps
+from threading import Lock
+
+from graphs.shortest_path_tree import ShortestPathTree
+
+
+class QueryCache:
+    """ QueryCache Class
+    A size-bounded, least-recently-used cache of graph query results.
+
+    Every entry belongs to one version of the graph. As soon as the cache is
+    asked about a newer version, all of the old entries are thrown away. A lock
+    keeps the entries consistent when several threads query the same graph.
+    """
+    def __init__(self, max_size=128):
+        """
+        Initialize an empty cache.
+
+        Parameters:
+        max_size (integer): The most results to keep before evicting the least
+            recently used one.
+        """
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self.max_size = max_size
+        self.version = None
+        self.results = OrderedDict() # (algorithm, args) -> result
+        self.hits = 0
+        self.misses = 0
+        self.lock = Lock()
+
+    def lookup(self, version, key):
+        """
+        Look up a cached result.
+
+        Parameters:
+        version (integer): The current version of the graph.
+        key (tuple): The algorithm name followed by its arguments.
+
+        Returns:
+        tuple: (True, result) on a hit, or (False, None) on a miss.
+        """
+        with self.lock:
+            if version != self.version:
+                self.results.clear()
+                self.version = version
+            if key in self.results:
+                self.results.move_to_end(key)
+                self.hits += 1
+                return True, self.results[key]
+            self.misses += 1
+            return False, None
+
+    def store(self, version, key, result):
+        """Save a result for `key`, evicting the oldest entry if full."""
+        with self.lock:
+            if version != self.version:
+                self.results.clear()
+                self.version = version
+            self.results[key] = result
+            self.results.move_to_end(key)
+            if len(self.results) > self.max_size:
+                self.results.popitem(last=False)
+
+    def clear(self):
+        """Remove every cached result and reset the statistics."""
+        with self.lock:
+            self.results.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def get_stats(self):
+        """Return a dictionary with the hits, misses, size and max_size."""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self.results),
+            'max_size': self.max_size,
+        }
+
+
+class QueryCacheMixin:
+    """
+    The query caching shared by Graph, WeightedGraph and the graph views, so
+    that it behaves the same for all of them. Everything is keyed on the
+    graph's `get_version()`, so cached results and shortest path trees are
+    dropped as soon as the graph changes.
+    """
+    def _init_query_caches(self):
+        """Set up the caches; call this from `__init__`."""
+        self.query_cache = None
+        # source id -> ShortestPathTree, for the current version only
+        self.path_trees = QueryCache(max_size=16)
+
+    def enable_query_cache(self, max_size=128):
+        """
+        Start caching the results of `find_shortest_path`,
+        `get_connected_components` and `is_bipartite`. Cached results are
+        dropped as soon as the graph changes.
+
+        Parameters:
+        max_size (integer): The most results to keep at once.
+
+        Returns:
+        QueryCache: The new cache, which also keeps hit/miss statistics.
+        """
+        self.query_cache = QueryCache(max_size)
+        return self.query_cache
+
+    def disable_query_cache(self):
+        """Stop caching query results and drop the cache."""
+        self.query_cache = None
+
+    def get_query_cache(self):
+        """Return the query cache, or None if caching is not enabled."""
+        return self.query_cache
+
+    def get_shortest_path_tree(self, start_id):
+        """
+        Return the `ShortestPathTree` from start_id for the current version of
+        the graph. The most recently used trees are kept, so repeated queries
+        from the same start vertex reuse the same search.
+        """
+        version = self.get_version()
+        found, tree = self.path_trees.lookup(version, start_id)
+        if not found:
+            tree = ShortestPathTree(self, start_id)
+            self.path_trees.store(version, start_id, tree)
+        return tree
+
+
+def cached_query(method):
+    """
+    Decorate a graph method so that its results are saved in the graph's query
+    cache, if the graph has one enabled. Cached results are returned as-is, so
+    callers should not modify them.
+    """
+    algorithm = method.__name__
+
+    @wraps(method)
+    def wrapper(self, *args):
+        cache = self.get_query_cache()
+        if cache is None:
+            return method(self, *args)
+
+        key = (algorithm,) + args
+        version = self.get_version()
+        found, result = cache.lookup(version, key)
+        if not found:
+            result = method(self, *args)
+            cache.store(version, key, result)
+        return result
+
+    return wrapper
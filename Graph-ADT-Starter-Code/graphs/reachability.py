@@ -0,0 +1,100 @@
+class ReachabilityIndex:
+    """ ReachabilityIndex Class
+    Answers "can vertex A reach vertex B?" without searching the graph.
+
+    The graph is condensed into its strongly connected components (every
+    vertex in a component reaches every other one). Each component then gets a
+    bitset of the components it can reach, filled in once in reverse
+    topological order. A query is a dictionary lookup plus one bit test.
+    """
+    def __init__(self, graph):
+        """
+        Build the index for a graph.
+
+        Parameters:
+        graph (Graph): The graph to index. If the graph is changed other than
+            through `add_edge` below, the index rebuilds itself on the next query.
+        """
+        self.__graph = graph
+        self.rebuild()
+
+    def rebuild(self):
+        """Build the index from scratch for the current state of the graph."""
+        components, dag = self.__graph.get_condensation()
+        num_components = len(components)
+
+        self.__component_of = {}
+        for i, component in enumerate(components):
+            for vertex_id in component:
+                self.__component_of[vertex_id] = i
+
+        # components are in topological order, so going backwards every
+        # successor's bitset is finished before it is needed
+        reach = [0] * num_components
+        for i in range(num_components - 1, -1, -1):
+            bits = 1 << i
+            for neighbor in dag.get_vertex(i).get_neighbors():
+                bits |= reach[neighbor.get_id()]
+            reach[i] = bits
+
+        self.__num_bytes = (num_components + 7) // 8
+        self.__rows = [self.__to_row(bits) for bits in reach]
+        self.__version = self.__graph.get_version()
+
+    def __to_row(self, bits):
+        """Turn an int bitset into a bytearray, for constant-time bit tests."""
+        return bytearray(bits.to_bytes(self.__num_bytes, 'little'))
+
+    def __has_bit(self, row, bit):
+        return (row[bit >> 3] >> (bit & 7)) & 1
+
+    def __check_current(self):
+        if self.__graph.get_version() != self.__version:
+            self.rebuild()
+
+    def reaches(self, start_id, target_id):
+        """
+        Return True if there is a path from start_id to target_id. Every vertex
+        reaches itself.
+        """
+        self.__check_current()
+        if start_id not in self.__component_of or target_id not in self.__component_of:
+            raise KeyError("One or both vertices are not in the graph!")
+
+        start_comp = self.__component_of[start_id]
+        target_comp = self.__component_of[target_id]
+        return bool(self.__has_bit(self.__rows[start_comp], target_comp))
+
+    def add_edge(self, vertex_id1, vertex_id2):
+        """
+        Add an edge to the graph and update the index without rebuilding it,
+        unless the new edge joins two components into one.
+
+        Parameters:
+        vertex_id1 (string): The unique identifier of the first vertex.
+        vertex_id2 (string): The unique identifier of the second vertex.
+        """
+        self.__check_current()
+        already_reaches = self.reaches(vertex_id1, vertex_id2)
+        reaches_back = self.reaches(vertex_id2, vertex_id1)
+        self.__graph.add_edge(vertex_id1, vertex_id2)
+
+        comp1 = self.__component_of[vertex_id1]
+        comp2 = self.__component_of[vertex_id2]
+        # an undirected graph also gets the edge back from vertex_id2
+        mirrored = any(n.get_id() == vertex_id1
+                       for n in self.__graph.get_vertex(vertex_id2).get_neighbors())
+
+        if comp1 != comp2 and (reaches_back or mirrored):
+            # the edge closes a cycle, so components merge
+            self.rebuild()
+            return
+
+        if not already_reaches:
+            # everything that reaches vertex_id1 now reaches all that vertex_id2 does
+            new_bits = int.from_bytes(self.__rows[comp2], 'little')
+            for i, row in enumerate(self.__rows):
+                if self.__has_bit(row, comp1):
+                    bits = int.from_bytes(row, 'little') | new_bits
+                    self.__rows[i] = self.__to_row(bits)
+        self.__version = self.__graph.get_version()
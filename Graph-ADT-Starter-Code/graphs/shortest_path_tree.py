@@ -0,0 +1,149 @@
+from array import array
+from collections import deque
+from heapq import heappush, heappop
+from threading import Lock
+
+
+class ShortestPathTree:
+    """ ShortestPathTree Class
+    The shortest paths from one source vertex to every other vertex.
+
+    Distances and parent pointers are kept in arrays indexed by vertex position.
+    The search only runs as far as it needs to: asking about a vertex that has
+    not been reached yet resumes the search (BFS for a `Graph`, Dijkstra for a
+    `WeightedGraph`) from where it last stopped, using the saved queue or heap.
+
+    Trees are shared between callers, so resuming the search and reading the
+    result back happen under a lock; concurrent readers wait for each other
+    instead of seeing a half-finished step.
+
+    A tree describes the graph as it was when the tree was made. Graphs hand out
+    trees through `get_shortest_path_tree`, which makes a new one whenever the
+    graph has changed.
+    """
+    def __init__(self, graph, source_id):
+        """
+        Initialize a tree with only the source vertex reached.
+
+        Parameters:
+        graph (Graph): The graph to search. Edge weights are used if its
+            vertices have them, otherwise every edge counts as 1.
+        source_id (string): The id of the source vertex.
+        """
+        if not graph.contains_id(source_id):
+            raise KeyError("The vertex is not in the graph!")
+
+        self.__vertices = graph.get_vertices()
+        self.__ids = [vertex.get_id() for vertex in self.__vertices]
+        self.__index_of = {vertex_id: i for i, vertex_id in enumerate(self.__ids)}
+        self.__source_id = source_id
+        self.__is_weighted = hasattr(
+            graph.get_vertex(source_id), 'get_neighbors_with_weights')
+
+        num_vertices = len(self.__ids)
+        source_index = self.__index_of[source_id]
+        self.__distances = [None] * num_vertices
+        self.__parents = array('q', [-1]) * num_vertices
+        # 1 once a vertex's distance is final
+        self.__settled = bytearray(num_vertices)
+        self.__distances[source_index] = 0
+        self.__lock = Lock()
+
+        if self.__is_weighted:
+            self.__heap = [(0, source_index)]
+        else:
+            # in BFS a vertex's distance is final as soon as it is reached
+            self.__settled[source_index] = 1
+            self.__queue = deque([source_index])
+
+    def get_source_id(self):
+        """Return the id of the source vertex."""
+        return self.__source_id
+
+    def is_complete(self):
+        """Return True if every reachable vertex has been settled."""
+        with self.__lock:
+            if self.__is_weighted:
+                return len(self.__heap) == 0
+            return len(self.__queue) == 0
+
+    def __settle_until(self, target_index):
+        """
+        Resume the search until `target_index` is settled or none are left.
+        The caller must hold the lock.
+        """
+        settled = self.__settled
+        if settled[target_index]:
+            return
+
+        distances = self.__distances
+        parents = self.__parents
+        index_of = self.__index_of
+        vertices = self.__vertices
+
+        if not self.__is_weighted:
+            queue = self.__queue
+            while queue:
+                current_index = queue.popleft()
+                next_distance = distances[current_index] + 1
+                for neighbor in vertices[current_index].get_neighbors():
+                    neighbor_index = index_of[neighbor.get_id()]
+                    if not settled[neighbor_index]:
+                        settled[neighbor_index] = 1
+                        distances[neighbor_index] = next_distance
+                        parents[neighbor_index] = current_index
+                        queue.append(neighbor_index)
+                if settled[target_index]:
+                    return
+            return
+
+        heap = self.__heap
+        while heap:
+            current_dist, current_index = heappop(heap)
+            if settled[current_index]:
+                continue # an outdated heap entry
+            settled[current_index] = 1
+            for neighbor, weight in vertices[current_index].get_neighbors_with_weights():
+                neighbor_index = index_of[neighbor.get_id()]
+                if settled[neighbor_index]:
+                    continue
+                new_dist = current_dist + weight
+                old_dist = distances[neighbor_index]
+                if old_dist is None or new_dist < old_dist:
+                    distances[neighbor_index] = new_dist
+                    parents[neighbor_index] = current_index
+                    heappush(heap, (new_dist, neighbor_index))
+            if current_index == target_index:
+                return
+
+    def get_distance(self, target_id):
+        """
+        Return the length of the shortest path from the source to `target_id`,
+        or None if `target_id` can't be reached.
+        """
+        target_index = self.__index_of[target_id]
+        with self.__lock:
+            self.__settle_until(target_index)
+            if not self.__settled[target_index]:
+                return None
+            return self.__distances[target_index]
+
+    def get_path(self, target_id):
+        """
+        Return the list of vertex ids on the shortest path from the source to
+        `target_id`, or None if `target_id` can't be reached.
+        """
+        target_index = self.__index_of[target_id]
+        ids = self.__ids
+        parents = self.__parents
+        path = []
+        with self.__lock:
+            self.__settle_until(target_index)
+            if not self.__settled[target_index]:
+                return None
+            current_index = target_index
+            while current_index != -1:
+                path.append(ids[current_index])
+                current_index = parents[current_index]
+        path.reverse()
+        return path
@@ -0,0 +1,135 @@
+from collections import deque
+
+
+class GraphSnapshot:
+    """ GraphSnapshot Class
+    A frozen, read-only view of a graph at the moment it was published.
+
+    The adjacency is stored as plain dictionaries and tuples of vertex ids, so a
+    snapshot is safe to share between reader threads and can be pickled and sent
+    to other processes.
+    """
+    def __init__(self, adjacency, is_directed, version):
+        """
+        Initialize a snapshot. Snapshots are made by `Graph.publish_snapshot`.
+
+        Parameters:
+        adjacency (dict): vertex id -> tuple of neighbor ids. It must not be
+            changed once the snapshot is made.
+        is_directed (boolean): Whether the graph is directed.
+        version (integer): Increases by one with each published snapshot.
+        """
+        self.__adjacency = adjacency
+        self.__is_directed = is_directed
+        self.__version = version
+
+    def get_version(self):
+        """Return the version number of this snapshot."""
+        return self.__version
+
+    def is_directed(self):
+        """Return True if the snapshot was taken from a directed graph."""
+        return self.__is_directed
+
+    def contains_id(self, vertex_id):
+        return vertex_id in self.__adjacency
+
+    def get_vertex_ids(self):
+        """Return the ids of all vertices in the snapshot."""
+        return list(self.__adjacency.keys())
+
+    def get_neighbor_ids(self, vertex_id):
+        """Return a tuple of the ids of the neighbors of `vertex_id`."""
+        if vertex_id not in self.__adjacency:
+            raise KeyError("The vertex is not in the graph!")
+        return self.__adjacency[vertex_id]
+
+    def get_adjacency(self):
+        """
+        Return the adjacency dictionary (id -> tuple of neighbor ids). The
+        tuples may be shared with older and newer snapshots, so treat the
+        result as read-only.
+        """
+        return self.__adjacency
+
+    def bfs_traversal(self, start_id):
+        """
+        Return the ids reachable from `start_id`, in breadth-first order.
+        """
+        if start_id not in self.__adjacency:
+            raise KeyError("The vertex is not in the graph!")
+
+        adjacency = self.__adjacency
+        seen = {start_id}
+        order = [start_id]
+        queue = deque([start_id])
+        while queue:
+            current_id = queue.popleft()
+            for neighbor_id in adjacency[current_id]:
+                if neighbor_id not in seen:
+                    seen.add(neighbor_id)
+                    order.append(neighbor_id)
+                    queue.append(neighbor_id)
+        return order
+
+    def find_shortest_path(self, start_id, target_id):
+        """
+        Find and return the shortest path from start_id to target_id.
+
+        Parameters:
+        start_id (string): The id of the start vertex.
+        target_id (string): The id of the target (end) vertex.
+
+        Returns:
+        list<string>: A list of all vertex ids in the shortest path, from start
+        to end, or None if there is no path.
+        """
+        adjacency = self.__adjacency
+        if start_id not in adjacency or target_id not in adjacency:
+            raise KeyError("One or both vertices are not in the graph!")
+
+        # vertex id -> the id we reached it from
+        parents = {start_id: None}
+        queue = deque([start_id])
+        while queue and target_id not in parents:
+            current_id = queue.popleft()
+            for neighbor_id in adjacency[current_id]:
+                if neighbor_id not in parents:
+                    parents[neighbor_id] = current_id
+                    queue.append(neighbor_id)
+
+        if target_id not in parents: # path not found
+            return None
+
+        path = []
+        current_id = target_id
+        while current_id is not None:
+            path.append(current_id)
+            current_id = parents[current_id]
+        path.reverse()
+        return path
+
+    def get_connected_components(self):
+        """
+        Return a list of all connected components, with each connected component
+        represented as a list of vertex ids. Edges are followed in their stored
+        direction, as in `Graph.get_connected_components`.
+        """
+        adjacency = self.__adjacency
+        seen = set()
+        components = []
+        for start_id in adjacency:
+            if start_id in seen:
+                continue
+            seen.add(start_id)
+            component = [start_id]
+            queue = deque([start_id])
+            while queue:
+                current_id = queue.popleft()
+                for neighbor_id in adjacency[current_id]:
+                    if neighbor_id not in seen:
+                        seen.add(neighbor_id)
+                        component.append(neighbor_id)
+                        queue.append(neighbor_id)
+            components.append(component)
+        return components
@@ -1,4 +1,92 @@
-from graphs.graph import Graph, Vertex
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from heapq import heappush, heappop
+
+from graphs.flow import FlowNetwork
+from graphs.graph import Graph, Vertex, _as_rows
+from graphs.query_cache import cached_query
+
+
+class NegativeCycleError(ValueError):
+    """Raised when shortest paths are asked for in a graph with a negative cycle."""
+
+    def __init__(self, cycle):
+        """
+        Parameters:
+        cycle (list<string>): The vertex ids around the cycle, in order.
+        """
+        super().__init__(f'The graph contains a negative cycle: {cycle}')
+        self.cycle = cycle
+
+
+# adjacency lists used by Johnson's algorithm, set up once in each worker process
+_johnson_adjacency = None
+
+
+def _init_johnson_worker(adjacency):
+    global _johnson_adjacency
+    _johnson_adjacency = adjacency
+
+
+def _dijkstra_all(adjacency, source):
+    """
+    Heap-based Dijkstra over index adjacency lists (index -> list of
+    (neighbor index, weight)). Returns a list of distances, None if unreachable.
+    """
+    distances = [None] * len(adjacency)
+    distances[source] = 0
+    settled = bytearray(len(adjacency))
+    heap = [(0, source)]
+    while heap:
+        current_dist, current = heappop(heap)
+        if settled[current]:
+            continue
+        settled[current] = 1
+        for neighbor, weight in adjacency[current]:
+            new_dist = current_dist + weight
+            if not settled[neighbor] and (distances[neighbor] is None
+                                          or new_dist < distances[neighbor]):
+                distances[neighbor] = new_dist
+                heappush(heap, (new_dist, neighbor))
+    return distances
+
+
+def _dijkstra_path(adjacency, start, target, removed_edges, removed_vertices):
+    """
+    Heap-based Dijkstra over index adjacency lists that skips the given edges
+    ((u, v) index pairs) and vertices, and stops once target is settled.
+    Returns (weight, list of indices), or None if target can't be reached.
+    """
+    distances = {start: 0}
+    parents = {start: None}
+    settled = set()
+    heap = [(0, start)]
+    while heap:
+        current_dist, current = heappop(heap)
+        if current in settled:
+            continue
+        settled.add(current)
+        if current == target:
+            path = []
+            while current is not None:
+                path.append(current)
+                current = parents[current]
+            path.reverse()
+            return current_dist, path
+        for neighbor, weight in adjacency[current]:
+            if (neighbor in settled or neighbor in removed_vertices
+                    or (current, neighbor) in removed_edges):
+                continue
+            new_dist = current_dist + weight
+            if neighbor not in distances or new_dist < distances[neighbor]:
+                distances[neighbor] = new_dist
+                parents[neighbor] = current
+                heappush(heap, (new_dist, neighbor))
+    return None
+
+
+def _dijkstra_all_in_worker(source):
+    return _dijkstra_all(_johnson_adjacency, source)
 
 class WeightedVertex(Vertex):
     
@@ -25,6 +113,18 @@ class WeightedVertex(Vertex):
 
         self.neighbors_dict[vertex_obj.get_id()] = (vertex_obj, weight)
 
+    def remove_neighbor(self, vertex_id):
+        """
+        Remove the neighbor with the given id from the neighbors dictionary.
+
+        Parameters:
+        vertex_id (string): The id of the neighbor to remove.
+
+        Returns:
+        boolean: True if the vertex was a neighbor, False otherwise.
+        """
+        return self.neighbors_dict.pop(vertex_id, None) is not None
+
     def get_neighbors(self):
         """Return the neighbors of this vertex."""
         return [neighbor for (neighbor, weight) in self.neighbors_dict.values()]
@@ -61,6 +161,10 @@ class WeightedGraph(Graph):
         """
         self.vertex_dict = {}
         self.is_directed = is_directed
+        self.incoming_dict = {} # id -> set of ids with an edge into it (directed only)
+        self.version = 0 # bumped by every change, to invalidate cached results
+        self._init_query_caches()
+        self.negative_weights = (None, False) # (version, whether any weight is < 0)
 
     def add_vertex(self, vertex_id):
         """
@@ -76,6 +180,9 @@ class WeightedGraph(Graph):
             return False # it's already there
         vertex_obj = WeightedVertex(vertex_id)
         self.vertex_dict[vertex_id] = vertex_obj
+        if self.is_directed:
+            self.incoming_dict[vertex_id] = set()
+        self.version += 1
         return True
 
     def get_vertex(self, vertex_id):
@@ -94,19 +201,146 @@ class WeightedGraph(Graph):
         vertex_id2 (string): The unique identifier of the second vertex.
         weight (number): The edge weight.
         """
-        all_ids = self.vertex_dict.keys()
-        if vertex_id1 not in all_ids or vertex_id2 not in all_ids:
+        vertex_obj1 = self.vertex_dict.get(vertex_id1)
+        vertex_obj2 = self.vertex_dict.get(vertex_id2)
+        if vertex_obj1 is None or vertex_obj2 is None:
             return False
-        vertex_obj1 = self.get_vertex(vertex_id1)
-        vertex_obj2 = self.get_vertex(vertex_id2)
         vertex_obj1.add_neighbor(vertex_obj2, weight)
         if not self.is_directed:
             vertex_obj2.add_neighbor(vertex_obj1, weight)
+        else:
+            self.incoming_dict[vertex_id2].add(vertex_id1)
+        self.version += 1
+
+    def add_vertices(self, vertex_ids):
+        """
+        Add many vertices to the graph at once. Ids that are already in the
+        graph are skipped.
+
+        Parameters:
+        vertex_ids (iterable<string>): The ids of the new vertices. A NumPy
+            array is accepted as well.
+
+        Returns:
+        int: The number of vertices that were added.
+        """
+        vertex_dict = self.vertex_dict
+        num_added = 0
+        for vertex_id in _as_rows(vertex_ids):
+            if vertex_id not in vertex_dict:
+                vertex_dict[vertex_id] = WeightedVertex(vertex_id)
+                if self.is_directed:
+                    self.incoming_dict[vertex_id] = set()
+                num_added += 1
+        self.version += 1
+        return num_added
+
+    def add_edges(self, edges):
+        """
+        Add many weighted edges to the graph at once. Every endpoint is checked
+        before any edge is added, so a bad edge leaves the graph unchanged.
+
+        Parameters:
+        edges (iterable<tuple>): Triples of (vertex_id1, vertex_id2, weight).
+            A NumPy array with one edge per row is accepted as well.
+
+        Returns:
+        bool: False if an endpoint is missing (nothing is added), True otherwise.
+        """
+        vertex_dict = self.vertex_dict
+        triples = []
+        for edge in _as_rows(edges):
+            vertex_id1, vertex_id2, weight = edge
+            vertex_obj1 = vertex_dict.get(vertex_id1)
+            vertex_obj2 = vertex_dict.get(vertex_id2)
+            if vertex_obj1 is None or vertex_obj2 is None:
+                return False
+            triples.append((vertex_obj1, vertex_id1, vertex_obj2, vertex_id2, weight))
+
+        self.version += 1
+        # Write straight into the neighbor dictionaries; like `add_neighbor`,
+        # the first weight given for an edge wins.
+        for vertex_obj1, vertex_id1, vertex_obj2, vertex_id2, weight in triples:
+            vertex_obj1.neighbors_dict.setdefault(vertex_id2, (vertex_obj2, weight))
+            if not self.is_directed:
+                vertex_obj2.neighbors_dict.setdefault(vertex_id1, (vertex_obj1, weight))
+            else:
+                self.incoming_dict[vertex_id2].add(vertex_id1)
+        return True
+
+    def remove_edge(self, vertex_id1, vertex_id2):
+        """
+        Remove the edge from vertex `vertex_id1` to vertex `vertex_id2`. In an
+        undirected graph the mirrored edge is removed as well.
+
+        Parameters:
+        vertex_id1 (string): The unique identifier of the first vertex.
+        vertex_id2 (string): The unique identifier of the second vertex.
+
+        Returns:
+        bool: True if the edge was removed, False if it wasn't in the graph.
+        """
+        vertex_obj1 = self.vertex_dict.get(vertex_id1)
+        vertex_obj2 = self.vertex_dict.get(vertex_id2)
+        if vertex_obj1 is None or vertex_obj2 is None:
+            return False
+        if not vertex_obj1.remove_neighbor(vertex_id2):
+            return False
+        self.version += 1
+        if not self.is_directed:
+            vertex_obj2.remove_neighbor(vertex_id1)
+        else:
+            self.incoming_dict[vertex_id2].discard(vertex_id1)
+        return True
+
+    def remove_vertex(self, vertex_id):
+        """
+        Remove a vertex and every edge into or out of it, in
+        O(in-degree + out-degree) time.
+
+        Parameters:
+        vertex_id (string): The unique identifier of the vertex to remove.
+
+        Returns:
+        bool: True if the vertex was removed, False if it wasn't in the graph.
+        """
+        vertex_obj = self.vertex_dict.pop(vertex_id, None)
+        if vertex_obj is None:
+            return False
+        self.version += 1
+        if not self.is_directed:
+            for neighbor in vertex_obj.get_neighbors():
+                neighbor.remove_neighbor(vertex_id)
+            return True
+
+        for neighbor in vertex_obj.get_neighbors():
+            self.incoming_dict[neighbor.get_id()].discard(vertex_id)
+        for incoming_id in self.incoming_dict.pop(vertex_id):
+            if incoming_id != vertex_id:
+                self.vertex_dict[incoming_id].remove_neighbor(vertex_id)
+        return True
 
     def get_vertices(self):
         """Return all the vertices in the graph"""
         return list(self.vertex_dict.values())
 
+    def contains_id(self, vertex_id):
+        return vertex_id in self.vertex_dict
+
+    def get_version(self):
+        """Return a number that changes every time the graph is changed."""
+        return self.version
+
+    def is_directed_graph(self):
+        """Return True if the graph is directed, and False otherwise."""
+        return self.is_directed
+
+    def publish_snapshot(self):
+        """Snapshots only exist for unweighted graphs; see `Graph.publish_snapshot`."""
+        raise TypeError("Snapshots are only supported for Graph, not WeightedGraph")
+
+    get_snapshot = publish_snapshot
+
     def __iter__(self):
         """Iterate over the vertex objects in the graph, to use sytax:
         for vertex in graph"""
@@ -205,56 +439,280 @@ class WeightedGraph(Graph):
 
         return mst_weight
     
+    @cached_query
     def find_shortest_path(self, start_id, target_id):
         """
         Use Dijkstra's Algorithm to return the total weight of the shortest path
         from a start vertex to a destination.
         """
-        # Create a dictionary `vertex_to_distance` and initialize all
-        # vertices to INFINITY - hint: use `float('inf')`
-        vertex_to_distance = {}
-        vertices = self.vertex_dict
-        for vertex in vertices:
-            vertex_to_distance[vertex] = WeightedGraph.INFINITY
-
-        min_distance = 0
-        current_id = start_id
-        vertex_to_distance[current_id] = 0
-
-        # While `vertex_to_distance` is not empty:
-        # 1. Get the minimum-distance remaining vertex, remove it from the
-        #    dictionary. If it is the target vertex, return its distance.
-        # 2. Update that vertex's neighbors by adding the edge weight to the
-        #    vertex's distance, if it is lower than previous.
-        while len(vertex_to_distance) > 0:
-            current_obj = self.get_vertex(current_id)
-            neighbors = current_obj.get_neighbors_with_weights()
-            current_vertex_dist = vertex_to_distance.pop(current_id)
+        if not self.contains_id(start_id) or not self.contains_id(target_id):
+            raise KeyError("One or both vertices are not in the graph!")
+
+        # Dijkstra gives wrong answers with negative weights
+        if self.has_negative_weights():
+            distance = self.bellman_ford(start_id)[target_id]
+            return None if distance == WeightedGraph.INFINITY else distance
+
+        # The tree runs a heap-based Dijkstra only until target_id is settled,
+        # and is kept so that a later call from the same start vertex can pick
+        # up the search where this one stopped. Returns None if not reachable.
+        return self.get_shortest_path_tree(start_id).get_distance(target_id)
+
+    def has_negative_weights(self):
+        """Return True if any edge in the graph has a negative weight."""
+        version, has_negative = self.negative_weights
+        if version != self.version:
+            has_negative = any(weight < 0
+                               for vertex_obj in self.get_vertices()
+                               for neighbor, weight in vertex_obj.get_neighbors_with_weights())
+            self.negative_weights = (self.version, has_negative)
+        return has_negative
+
+    def __index_adjacency(self):
+        """
+        Return (ids, adjacency), where adjacency[i] lists (neighbor index,
+        weight) for the vertex with id ids[i].
+        """
+        vertices = self.get_vertices()
+        ids = [vertex_obj.get_id() for vertex_obj in vertices]
+        index_of = {vertex_id: i for i, vertex_id in enumerate(ids)}
+        adjacency = [[(index_of[neighbor.get_id()], weight)
+                      for neighbor, weight in vertex_obj.get_neighbors_with_weights()]
+                     for vertex_obj in vertices]
+        return ids, adjacency
+
+    def __spfa(self, ids, adjacency, sources):
+        """
+        Bellman-Ford with a work queue (SPFA) over index adjacency lists. Only
+        vertices whose distance just went down are looked at again, and the
+        search stops as soon as nothing changes.
 
-            for neighbor in neighbors:
-                neighbor_id, neighbor_dist = neighbor[0].get_id(), neighbor[1]
-                if neighbor_id in vertex_to_distance:
-                    new_dist = current_vertex_dist + neighbor_dist
-                    if new_dist < vertex_to_distance[neighbor_id]:
-                        vertex_to_distance[neighbor_id] = new_dist
-            
-            min_dist = WeightedGraph.INFINITY
-            min_id = None
-            for v_id, v_dist in zip(vertex_to_distance.keys(), vertex_to_distance.values()):
-                v_weight = vertex_to_distance[v_id]
-                if v_dist < min_dist:
-                    min_dist = v_dist
-                    min_id = v_id
-            min_distance = min_dist
-            
-            current_id = min_id
-            if current_id == target_id:
-                print(min_distance)
-                return min_distance
+        Parameters:
+        sources (list<int>): Indices that start at distance 0. Starting with
+            every vertex is the same as adding a new source with 0-weight edges
+            to all of them, as Johnson's algorithm does.
+
+        Returns:
+        list: Distances by index, INFINITY if unreachable.
+        """
+        num_vertices = len(adjacency)
+        distances = [WeightedGraph.INFINITY] * num_vertices
+        parents = [-1] * num_vertices
+        num_edges = [0] * num_vertices # edges on the current best path
+        in_queue = bytearray(num_vertices)
+        queue = deque()
+        for source in sources:
+            distances[source] = 0
+            in_queue[source] = 1
+            queue.append(source)
+
+        while queue:
+            current = queue.popleft()
+            in_queue[current] = 0
+            current_dist = distances[current]
+            for neighbor, weight in adjacency[current]:
+                new_dist = current_dist + weight
+                if new_dist < distances[neighbor]:
+                    distances[neighbor] = new_dist
+                    parents[neighbor] = current
+                    num_edges[neighbor] = num_edges[current] + 1
+                    # a shortest path never needs V edges, unless it loops
+                    # around a negative cycle
+                    if num_edges[neighbor] >= num_vertices:
+                        raise NegativeCycleError(self.__find_cycle(ids, parents, neighbor))
+                    if not in_queue[neighbor]:
+                        in_queue[neighbor] = 1
+                        queue.append(neighbor)
+        return distances
+
+    def __find_cycle(self, ids, parents, start):
+        """Follow parent pointers from start until they loop, and return the loop."""
+        seen = set()
+        current = start
+        while current not in seen:
+            seen.add(current)
+            current = parents[current]
+
+        cycle = [current]
+        vertex = parents[current]
+        while vertex != current:
+            cycle.append(vertex)
+            vertex = parents[vertex]
+        cycle.reverse() # parents point backwards along the edges
+        return [ids[i] for i in cycle]
+
+    def k_shortest_paths(self, start_id, target_id):
+        """
+        Generate the simple paths from start_id to target_id in order of
+        increasing total weight, using Yen's algorithm. Paths are only worked
+        out when the next one is asked for, so the caller can stop early:
+
+            for weight, path in islice(graph.k_shortest_paths('A', 'J'), 10):
 
-        # Return None if target vertex not found.
-        return None
+        Yields:
+        tuple: (total weight, list of vertex ids from start to target).
+        """
+        if not self.contains_id(start_id) or not self.contains_id(target_id):
+            raise KeyError("One or both vertices are not in the graph!")
+        if self.has_negative_weights():
+            raise ValueError("k_shortest_paths needs non-negative edge weights")
+
+        ids, adjacency = self.__index_adjacency()
+        index_of = {vertex_id: i for i, vertex_id in enumerate(ids)}
+        start, target = index_of[start_id], index_of[target_id]
+        edge_weights = [dict(edges) for edges in adjacency] # u -> {v: weight}
+        # spur searches already done: (spur, removed edges, removed vertices) -> result
+        spur_cache = {}
+
+        def search(spur, removed_edges, removed_vertices):
+            key = (spur, removed_edges, removed_vertices)
+            if key not in spur_cache:
+                spur_cache[key] = _dijkstra_path(
+                    adjacency, spur, target, removed_edges, removed_vertices)
+            return spur_cache[key]
+
+        first = search(start, frozenset(), frozenset())
+        if first is None:
+            return
+        found = [first] # (weight, path) pairs already yielded
+        yield first[0], [ids[i] for i in first[1]]
+
+        candidates = [] # heap of (weight, path) not yet yielded
+        candidate_paths = set()
+        while True:
+            last_weight, last_path = found[-1]
+            # total weight of last_path up to each vertex
+            prefix_weights = [0]
+            for u, v in zip(last_path, last_path[1:]):
+                prefix_weights.append(prefix_weights[-1] + edge_weights[u][v])
+
+            # branch off the last path at each of its vertices
+            for i in range(len(last_path) - 1):
+                spur = last_path[i]
+                root = last_path[:i + 1]
+                # don't repeat a path already found that shares this root
+                removed_edges = frozenset((path[i], path[i + 1])
+                                          for weight, path in found
+                                          if len(path) > i + 1 and path[:i + 1] == root)
+                removed_vertices = frozenset(root[:-1]) # keep the path simple
+                spur_result = search(spur, removed_edges, removed_vertices)
+                if spur_result is None:
+                    continue
+
+                spur_weight, spur_path = spur_result
+                path = tuple(root[:-1] + spur_path)
+                if path not in candidate_paths:
+                    candidate_paths.add(path)
+                    heappush(candidates, (prefix_weights[i] + spur_weight, path))
+
+            if not candidates:
+                return
+            weight, path = heappop(candidates)
+            found.append((weight, list(path)))
+            yield weight, [ids[i] for i in path]
+
+    def max_flow(self, source_id, sink_id):
+        """
+        Find a maximum flow from source_id to sink_id, treating each edge
+        weight as the capacity of that edge. Uses Dinic's algorithm.
+
+        Returns:
+        tuple: (flow value, flows, (source side, sink side)), where flows maps
+        (start id, dest id) -> the flow on that edge (only edges with flow
+        are included), and the two sides are sets of vertex ids forming a
+        minimum cut.
+        """
+        if not self.contains_id(source_id) or not self.contains_id(sink_id):
+            raise KeyError("One or both vertices are not in the graph!")
+
+        ids, adjacency = self.__index_adjacency()
+        index_of = {vertex_id: i for i, vertex_id in enumerate(ids)}
+        network = FlowNetwork(len(ids))
+        edges = [] # (u, v, edge number in the network)
+        for u, neighbors in enumerate(adjacency):
+            for v, capacity in neighbors:
+                if capacity < 0:
+                    raise ValueError("Edge capacities can't be negative")
+                edges.append((u, v, len(network.heads)))
+                network.add_edge(u, v, capacity)
+
+        value = network.max_flow(index_of[source_id], index_of[sink_id])
+
+        # flow going both ways between two vertices cancels out
+        net_flow = {}
+        for u, v, e in edges:
+            flow = network.flow_on(e)
+            if flow:
+                net_flow[(u, v)] = net_flow.get((u, v), 0) + flow
+                net_flow[(v, u)] = net_flow.get((v, u), 0) - flow
+        flows = {(ids[u], ids[v]): flow
+                 for (u, v), flow in net_flow.items() if flow > 0}
+
+        source_side = {ids[i] for i in network.reachable_from(index_of[source_id])}
+        sink_side = set(ids) - source_side
+        return value, flows, (source_side, sink_side)
+
+    def bellman_ford(self, start_id):
+        """
+        Return a dictionary of vertex id -> the total weight of the shortest
+        path from start_id (INFINITY if unreachable). Unlike
+        `find_shortest_path`, negative edge weights are allowed.
 
+        Raises NegativeCycleError, which holds the cycle, if a negative cycle
+        can be reached from start_id.
+        """
+        if not self.contains_id(start_id):
+            raise KeyError("The vertex is not in the graph!")
+
+        ids, adjacency = self.__index_adjacency()
+        distances = self.__spfa(ids, adjacency, [ids.index(start_id)])
+        return dict(zip(ids, distances))
+
+    def johnson(self, processes=None):
+        """
+        Return the All-Pairs-Shortest-Paths dictionary (start id -> target id
+        -> distance, INFINITY if unreachable) using Johnson's algorithm.
+
+        Bellman-Ford runs once to find a potential h for every vertex. Each edge
+        weight w(u, v) becomes w + h(u) - h(v), which is never negative, so a
+        heap-based Dijkstra can run from every vertex. On sparse graphs this is
+        much faster than the O(V^3) `floyd_warshall`.
+
+        Parameters:
+        processes (int): If given, run the Dijkstra searches in a pool of this
+            many worker processes.
+
+        Raises NegativeCycleError if the graph has a negative cycle.
+        """
+        ids, adjacency = self.__index_adjacency()
+        potential = self.__spfa(ids, adjacency, range(len(ids)))
+
+        reweighted = [[(neighbor, weight + potential[i] - potential[neighbor])
+                       for neighbor, weight in edges]
+                      for i, edges in enumerate(adjacency)]
+
+        sources = range(len(ids))
+        if processes is None:
+            all_distances = (_dijkstra_all(reweighted, source) for source in sources)
+        else:
+            executor = ProcessPoolExecutor(
+                max_workers=processes, initializer=_init_johnson_worker,
+                initargs=(reweighted,))
+            with executor:
+                chunk_size = max(1, len(ids) // (processes * 4))
+                all_distances = list(executor.map(
+                    _dijkstra_all_in_worker, sources, chunksize=chunk_size))
+
+        dist = {}
+        for source, distances in zip(sources, all_distances):
+            row = dist[ids[source]] = {}
+            for target, distance in enumerate(distances):
+                if distance is None:
+                    row[ids[target]] = WeightedGraph.INFINITY
+                else:
+                    # undo the reweighting
+                    row[ids[target]] = distance - potential[source] + potential[target]
+        return dist
 
     def floyd_warshall(self):
         """
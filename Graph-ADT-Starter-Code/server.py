@@ -0,0 +1,220 @@
+import argparse
+import asyncio
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from util.file_reader import read_graph_from_file
+
+
+# the graph each worker process answers queries on, loaded once at startup
+_worker_graph = None
+
+
+def _init_worker(filename, loader):
+    global _worker_graph
+    _worker_graph = loader(filename)
+
+
+def _warm_up():
+    """Do nothing; running it makes a worker start and load its graph."""
+    return os.getpid()
+
+
+def _shortest_path(graph, start_id, target_id):
+    return graph.find_shortest_path(start_id, target_id)
+
+
+def _n_away(graph, start_id, distance):
+    return graph.find_vertices_n_away(start_id, distance)
+
+
+def _components(graph):
+    return graph.get_connected_components()
+
+
+def _mst(graph):
+    if not hasattr(graph, 'minimum_spanning_tree_kruskal'):
+        raise ValueError("A minimum spanning tree needs a weighted graph")
+    return graph.minimum_spanning_tree_kruskal()
+
+
+QUERIES = {
+    'shortest_path': _shortest_path,
+    'n_away': _n_away,
+    'components': _components,
+    'mst': _mst,
+}
+
+
+def _run_query(op, args):
+    """Answer one query on the worker's graph."""
+    return QUERIES[op](_worker_graph, *args)
+
+
+class GraphServer:
+    """ GraphServer Class
+    A long-lived asyncio server that loads a graph once and answers JSON
+    queries over a local socket, so a query no longer pays for reading the
+    graph file.
+
+    Each request is one line of JSON, such as
+        {"id": 1, "op": "shortest_path", "args": ["A", "E"]}
+    and gets back one line, {"id": 1, "result": ...} or {"id": 1, "error": "..."}.
+    Requests on one connection are answered as they finish, not in order.
+
+    Queries run in a process pool whose workers each load the graph when they
+    start; `start` waits for every worker to do so before listening, so a bad
+    graph file is reported right away. If a worker dies, the pool is replaced.
+    A query that is already running is not started again: identical requests
+    wait on the same result. Each request gets `timeout` seconds.
+    """
+    def __init__(self, filename, loader=read_graph_from_file, max_workers=None, timeout=30.0):
+        """
+        Parameters:
+        filename (string): The graph file to serve.
+        loader (function): Reads the file into a graph. Must be a module-level
+            function, so that worker processes can use it.
+        max_workers (integer): The number of worker processes.
+        timeout (float): Seconds to wait for each request before giving up.
+        """
+        self.filename = filename
+        self.loader = loader
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.timeout = timeout
+        self.pool = self.__make_pool()
+        self.in_flight = {} # (op, args) -> (future shared by identical requests, its pool)
+        self.server = None
+
+    def __make_pool(self):
+        return ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker,
+                                   initargs=(self.filename, self.loader))
+
+    def __replace_pool(self, broken_pool):
+        """Swap in a new pool for one that broke, unless that was done already."""
+        if self.pool is broken_pool:
+            broken_pool.shutdown(wait=False, cancel_futures=True)
+            self.pool = self.__make_pool()
+
+    async def warm_up(self):
+        """
+        Start every worker process and wait until each has loaded the graph.
+        Raises RuntimeError if the graph can't be loaded.
+        """
+        loop = asyncio.get_running_loop()
+        pool = self.pool
+        # all submitted before any can finish, so each one starts a new worker
+        futures = [loop.run_in_executor(pool, _warm_up) for _ in range(self.max_workers)]
+        try:
+            await asyncio.gather(*futures)
+        except BrokenProcessPool as error:
+            self.__replace_pool(pool)
+            raise RuntimeError(f'The worker processes could not load {self.filename}') from error
+
+    async def start(self, host='127.0.0.1', port=0, path=None):
+        """
+        Start listening, on a Unix socket if path is given and on host:port
+        otherwise. Port 0 picks a free port; see `get_address`. The workers
+        are warmed up first, so the first queries don't wait for the graph to load.
+        """
+        await self.warm_up()
+        if path is not None:
+            self.server = await asyncio.start_unix_server(self.__handle_client, path=path)
+        else:
+            self.server = await asyncio.start_server(self.__handle_client, host, port)
+        return self.server
+
+    def get_address(self):
+        """Return the address the server is listening on."""
+        return self.server.sockets[0].getsockname()
+
+    async def close(self):
+        """Stop listening and shut down the worker processes."""
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        self.pool.shutdown(cancel_futures=True)
+
+    async def query(self, op, args=()):
+        """
+        Run a query in the pool and return its result. Raises KeyError for an
+        unknown op and asyncio.TimeoutError if it takes longer than the timeout.
+        If a worker died, raises BrokenProcessPool for the queries that were
+        running and replaces the pool, so later queries work again.
+        """
+        if op not in QUERIES:
+            raise KeyError(f'Unknown query: {op}')
+        key = (op, json.dumps(args))
+        future, pool = self.in_flight.get(key, (None, None))
+        try:
+            if future is None:
+                loop = asyncio.get_running_loop()
+                pool = self.pool
+                future = asyncio.ensure_future(loop.run_in_executor(pool, _run_query, op, list(args)))
+                self.in_flight[key] = (future, pool)
+                future.add_done_callback(lambda _: self.in_flight.pop(key, None))
+            # shielded, so one request timing out doesn't cancel it for the others
+            return await asyncio.wait_for(asyncio.shield(future), self.timeout)
+        except BrokenProcessPool:
+            self.__replace_pool(pool)
+            raise
+
+    async def __answer(self, request, writer):
+        request_id = request.get('id') if isinstance(request, dict) else None
+        try:
+            result = await self.query(request['op'], request.get('args', []))
+            response = {'id': request_id, 'result': result}
+        except asyncio.TimeoutError:
+            response = {'id': request_id, 'error': 'Timed out'}
+        except Exception as error:
+            response = {'id': request_id, 'error': f'{type(error).__name__}: {error}'}
+        writer.write((json.dumps(response) + '\n').encode())
+        await writer.drain()
+
+    async def __handle_client(self, reader, writer):
+        tasks = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    writer.write(b'{"id": null, "error": "Invalid JSON"}\n')
+                    continue
+                if not isinstance(request, dict):
+                    writer.write(b'{"id": null, "error": "A request must be a JSON object"}\n')
+                    continue
+                task = asyncio.ensure_future(self.__answer(request, writer))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+        finally:
+            writer.close()
+
+
+async def serve(filename, host, port, path, max_workers, timeout):
+    server = GraphServer(filename, max_workers=max_workers, timeout=timeout)
+    await server.start(host, port, path)
+    print(f'Serving {filename} on {server.get_address()}')
+    try:
+        await server.server.serve_forever()
+    finally:
+        await server.close()
+
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description='Serve graph queries over a local socket.')
+    parser.add_argument('filename')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix', dest='path', help='listen on this Unix socket instead')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--timeout', type=float, default=30.0)
+    args = parser.parse_args()
+
+    asyncio.run(serve(args.filename, args.host, args.port, args.path, args.workers, args.timeout))
@@ -0,0 +1,61 @@
+import unittest
+from graphs import centrality
+from graphs.graph import Graph
+
+
+class TestCentrality(unittest.TestCase):
+
+    def make_graph(self):
+        graph = Graph(is_directed=True)
+        graph.add_vertices(['A', 'B', 'C', 'D'])
+        graph.add_edges([('A','B'), ('B','C'), ('C','A'), ('A','C')])
+        return graph # D has no edges, so it is dangling
+
+    def test_to_csr(self):
+        ids, offsets, targets = centrality.to_csr(self.make_graph())
+        self.assertEqual(ids, ['A', 'B', 'C', 'D'])
+        self.assertEqual(list(offsets), [0, 2, 3, 4, 4])
+        self.assertEqual(list(targets), [1, 2, 2, 0])
+
+    def test_pagerank(self):
+        scores = centrality.pagerank(self.make_graph(), tolerance=1e-10)
+        self.assertAlmostEqual(sum(scores.values()), 1.0)
+        self.assertGreater(scores['C'], scores['B'])
+        self.assertGreater(scores['A'], scores['D'])
+
+    def test_pagerank_without_numpy(self):
+        graph = self.make_graph()
+        expected = centrality.pagerank(graph, tolerance=1e-12)
+        saved_np, centrality.np = centrality.np, None
+        try:
+            scores = centrality.pagerank(graph, tolerance=1e-12)
+        finally:
+            centrality.np = saved_np
+        for vertex_id in expected:
+            self.assertAlmostEqual(scores[vertex_id], expected[vertex_id])
+
+    def test_personalized_pagerank(self):
+        scores = centrality.pagerank(self.make_graph(), personalization=['D'])
+        self.assertAlmostEqual(scores['D'], 1.0)
+        scores = centrality.pagerank(self.make_graph(), personalization={'B': 1})
+        self.assertEqual(scores['D'], 0)
+        self.assertAlmostEqual(sum(scores.values()), 1.0)
+
+    def test_degree_and_closeness(self):
+        graph = Graph(is_directed=False)
+        graph.add_vertices(['A', 'B', 'C', 'D'])
+        graph.add_edges([('A','B'), ('B','C'), ('C','D')])
+
+        degrees = centrality.degree_centrality(graph)
+        self.assertAlmostEqual(degrees['B'], 2 / 3)
+
+        closeness = centrality.closeness_centrality(graph)
+        self.assertAlmostEqual(closeness['A'], 3 / 6)
+        self.assertAlmostEqual(closeness['B'], 3 / 4)
+
+        sampled = centrality.closeness_centrality(graph, samples=2, seed=1)
+        self.assertEqual(len(sampled), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
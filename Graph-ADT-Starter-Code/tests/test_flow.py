@@ -0,0 +1,45 @@
+import unittest
+from graphs.weighted_graph import WeightedGraph
+
+
+class TestMaxFlow(unittest.TestCase):
+
+    def make_network(self):
+        # the classic CLRS example, max flow 23
+        graph = WeightedGraph(is_directed=True)
+        graph.add_vertices(['s', 'v1', 'v2', 'v3', 'v4', 't'])
+        graph.add_edges([
+            ('s','v1', 16), ('s','v2', 13), ('v2','v1', 4), ('v1','v3', 12),
+            ('v3','v2', 9), ('v2','v4', 14), ('v4','v3', 7), ('v3','t', 20),
+            ('v4','t', 4),
+        ])
+        return graph
+
+    def test_max_flow_value_and_cut(self):
+        graph = self.make_network()
+        value, flows, (source_side, sink_side) = graph.max_flow('s', 't')
+
+        self.assertEqual(value, 23)
+        self.assertEqual(source_side, {'s', 'v1', 'v2', 'v4'})
+        self.assertEqual(sink_side, {'v3', 't'})
+
+        # flow is conserved at every inner vertex and fits every edge
+        for vertex_id in ['v1', 'v2', 'v3', 'v4']:
+            flow_in = sum(f for (u, v), f in flows.items() if v == vertex_id)
+            flow_out = sum(f for (u, v), f in flows.items() if u == vertex_id)
+            self.assertEqual(flow_in, flow_out)
+        self.assertLessEqual(flows[('s', 'v1')], 16)
+
+    def test_undirected_and_disconnected(self):
+        graph = WeightedGraph(is_directed=False)
+        graph.add_vertices(['A', 'B', 'C', 'D'])
+        graph.add_edges([('A','B', 3), ('B','C', 2), ('A','C', 1)])
+
+        self.assertEqual(graph.max_flow('A', 'C')[0], 3)
+        self.assertEqual(graph.max_flow('C', 'A')[0], 3)
+        value, flows, cut = graph.max_flow('A', 'D')
+        self.assertEqual((value, flows), (0, {}))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -37,6 +37,66 @@ class TestGraph(unittest.TestCase):
         self.assertEqual(len(vertex_b.get_neighbors()), 2)
         self.assertEqual(len(vertex_c.get_neighbors()), 2)
 
+    def test_add_vertex_keeps_existing_edges(self):
+        """Adding a vertex id twice keeps the original vertex and its edges."""
+        graph = Graph(is_directed=True)
+        vertex_a = graph.add_vertex('A')
+        graph.add_vertex('B')
+        graph.add_edge('A','B')
+
+        self.assertIs(graph.add_vertex('A'), vertex_a)
+        self.assertEqual(len(graph.get_vertex('A').get_neighbors()), 1)
+
+    def test_bulk_construction(self):
+        """Build a graph with add_vertices and add_edges."""
+        graph = Graph(is_directed=False)
+        vertex_a, vertex_b, vertex_c = graph.add_vertices(['A', 'B', 'C'])
+        graph.add_edges([('A','B'), ('A','C'), ('B','C')])
+
+        self.assertEqual(len(graph.get_vertices()), 3)
+        self.assertEqual(len(vertex_a.get_neighbors()), 2)
+        self.assertEqual(len(vertex_b.get_neighbors()), 2)
+        self.assertEqual(len(vertex_c.get_neighbors()), 2)
+
+    def test_bulk_edges_missing_vertex(self):
+        """A missing endpoint raises and leaves the graph unchanged."""
+        graph = Graph(is_directed=True)
+        graph.add_vertices(['A', 'B'])
+
+        with self.assertRaises(KeyError):
+            graph.add_edges([('A','B'), ('B','Z')])
+        self.assertEqual(len(graph.get_vertex('A').get_neighbors()), 0)
+
+    def test_remove_edge(self):
+        """Removing an undirected edge removes the mirrored edge too."""
+        graph = Graph(is_directed=False)
+        vertex_a, vertex_b, vertex_c = graph.add_vertices(['A', 'B', 'C'])
+        graph.add_edges([('A','B'), ('A','C')])
+        graph.remove_edge('B','A')
+
+        self.assertEqual(len(vertex_a.get_neighbors()), 1)
+        self.assertEqual(len(vertex_b.get_neighbors()), 0)
+        with self.assertRaises(KeyError):
+            graph.remove_edge('A','B')
+
+    def test_remove_vertex_directed(self):
+        """Removing a vertex drops its incoming and outgoing edges."""
+        graph = Graph(is_directed=True)
+        vertex_a, vertex_b, vertex_c = graph.add_vertices(['A', 'B', 'C'])
+        graph.add_edges([('A','B'), ('B','C'), ('C','B'), ('C','A')])
+        graph.remove_vertex('B')
+
+        self.assertEqual(len(graph.get_vertices()), 2)
+        self.assertFalse(graph.contains_id('B'))
+        self.assertEqual(len(vertex_a.get_neighbors()), 0)
+        self.assertEqual([n.get_id() for n in vertex_c.get_neighbors()], ['A'])
+
+        # the id can be reused without bringing old edges back
+        graph.add_vertex('B')
+        graph.remove_vertex('C')
+        self.assertEqual(len(graph.get_vertex('B').get_neighbors()), 0)
+        self.assertEqual(len(vertex_a.get_neighbors()), 0)
+
 class TestReadGraphFromFile(unittest.TestCase):
     def test_read_directed_graph_from_file(self):
         filename = 'test_files/graph_small_directed.txt'
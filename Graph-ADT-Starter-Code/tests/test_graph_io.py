@@ -0,0 +1,105 @@
+import gzip
+import os
+import tempfile
+import unittest
+from graphs.graph import Graph
+from graphs.graph_view import induced_subgraph
+from graphs.weighted_graph import WeightedGraph
+from util.graph_io import read_graph, write_graph
+
+
+class TestGraphIO(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def path(self, name, contents=None):
+        path = os.path.join(self.directory.name, name)
+        if contents is not None:
+            with open(path, 'w') as f:
+                f.write(contents)
+        return path
+
+    def test_read_weighted_graph(self):
+        path = self.path('weighted.txt', 'G\nA,B,C,D\n(A,B,4)\n(A,C,1)\n(C,B,2.5)\n')
+        graph = read_graph(path)
+
+        self.assertIsInstance(graph, WeightedGraph)
+        self.assertFalse(graph.is_directed)
+        self.assertEqual(len(graph.get_vertices()), 4)
+        self.assertEqual(graph.find_shortest_path('A', 'B'), 3.5)
+
+    def test_read_edge_list(self):
+        path = self.path('edges.txt', '# comment\n1 2\n2 3\n\n4\n')
+        graph = read_graph(path, is_directed=True)
+
+        self.assertIsInstance(graph, Graph)
+        self.assertEqual(sorted(v.get_id() for v in graph.get_vertices()), ['1', '2', '3', '4'])
+        self.assertEqual(graph.find_shortest_path('1', '3'), ['1', '2', '3'])
+        self.assertIsNone(graph.find_shortest_path('3', '1'))
+
+    def test_mixed_edges(self):
+        path = self.path('mixed.txt', '1 2\n2 3 5\n')
+        with self.assertRaises(ValueError):
+            read_graph(path)
+
+    def test_round_trip_gzip(self):
+        graph = WeightedGraph(is_directed=False)
+        graph.add_vertices(['A', 'B', 'C', 'D'])
+        graph.add_edges([('A','B', 4), ('B','C', 1), ('A','C', 7)])
+
+        for name, file_format in [('out.txt.gz', 'graph'), ('out.edges.gz', 'edgelist')]:
+            path = self.path(name)
+            write_graph(graph, path, file_format)
+            loaded = read_graph(path)
+
+            self.assertIsInstance(loaded, WeightedGraph)
+            self.assertFalse(loaded.is_directed_graph())
+            self.assertEqual(sorted(v.get_id() for v in loaded.get_vertices()), ['A', 'B', 'C', 'D'])
+            self.assertEqual(loaded.find_shortest_path('A', 'C'), 5)
+            self.assertEqual(loaded.find_shortest_path('C', 'A'), 5)
+
+    def test_edge_list_keeps_direction(self):
+        for is_directed in (True, False):
+            graph = Graph(is_directed=is_directed)
+            graph.add_vertices(['A', 'B', 'C'])
+            graph.add_edges([('A','B'), ('B','C')])
+            path = self.path('direction.edges')
+            write_graph(graph, path, 'edgelist')
+            # the header wins over the is_directed argument
+            loaded = read_graph(path, is_directed=not is_directed)
+
+            self.assertEqual(loaded.is_directed_graph(), is_directed)
+            for vertex_id in 'ABC':
+                self.assertEqual(len(loaded.get_vertex(vertex_id).get_neighbors()),
+                                 len(graph.get_vertex(vertex_id).get_neighbors()))
+
+    def test_write_view(self):
+        graph = Graph(is_directed=True)
+        graph.add_vertices(['A', 'B', 'C'])
+        graph.add_edges([('A','B'), ('B','C'), ('C','A')])
+        path = self.path('view.txt')
+        write_graph(induced_subgraph(graph, ['A', 'B']), path)
+        loaded = read_graph(path)
+
+        self.assertTrue(loaded.is_directed_graph())
+        self.assertEqual(sorted(v.get_id() for v in loaded.get_vertices()), ['A', 'B'])
+        self.assertEqual(loaded.find_shortest_path('A', 'B'), ['A', 'B'])
+        self.assertIsNone(loaded.find_shortest_path('B', 'A'))
+
+    def test_long_edge_list(self):
+        lines = [f'{i} {i + 1}\n' for i in range(500)]
+        path = self.path('chain.txt.gz')
+        with gzip.open(path, 'wt') as f:
+            f.writelines(lines)
+        graph = read_graph(path)
+
+        self.assertEqual([v.get_id() for v in graph.get_vertices()], [str(i) for i in range(501)])
+        self.assertEqual(len(graph.find_shortest_path('0', '500')), 501)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import pickle
+import unittest
+from graphs.graph import Graph
+from graphs.graph_view import graph_view
+from graphs.weighted_graph import WeightedGraph
+
+
+class TestGraphSnapshot(unittest.TestCase):
+
+    def make_graph(self):
+        graph = Graph(is_directed=False)
+        graph.add_vertices(['A', 'B', 'C', 'D', 'E'])
+        graph.add_edges([('A','B'), ('B','C'), ('D','E')])
+        return graph
+
+    def test_snapshot_is_frozen(self):
+        """Changes made after publishing don't show up in the snapshot."""
+        graph = self.make_graph()
+        snapshot = graph.publish_snapshot()
+        graph.add_edge('C','D')
+        graph.remove_vertex('A')
+
+        self.assertIs(graph.get_snapshot(), snapshot)
+        self.assertEqual(snapshot.find_shortest_path('A', 'C'), ['A', 'B', 'C'])
+        self.assertIsNone(snapshot.find_shortest_path('A', 'E'))
+
+        newer = graph.publish_snapshot()
+        self.assertEqual(newer.get_version(), snapshot.get_version() + 1)
+        self.assertFalse(newer.contains_id('A'))
+        self.assertEqual(newer.find_shortest_path('B', 'E'), ['B', 'C', 'D', 'E'])
+
+    def test_snapshot_shares_unchanged_vertices(self):
+        graph = self.make_graph()
+        snapshot = graph.publish_snapshot()
+        graph.add_edge('A','C')
+        newer = graph.publish_snapshot()
+
+        self.assertIs(newer.get_neighbor_ids('D'), snapshot.get_neighbor_ids('D'))
+        self.assertEqual(sorted(newer.get_neighbor_ids('A')), ['B', 'C'])
+        self.assertEqual(snapshot.get_neighbor_ids('A'), ('B',))
+
+    def test_snapshot_components_and_pickle(self):
+        graph = self.make_graph()
+        snapshot = pickle.loads(pickle.dumps(graph.publish_snapshot()))
+
+        components = [sorted(comp) for comp in snapshot.get_connected_components()]
+        self.assertCountEqual(components, [['A', 'B', 'C'], ['D', 'E']])
+        self.assertEqual(snapshot.bfs_traversal('A'), ['A', 'B', 'C'])
+
+    def test_snapshot_graph_only(self):
+        weighted = WeightedGraph(is_directed=False)
+        weighted.add_vertices(['A', 'B'])
+        weighted.add_edge('A', 'B', 1)
+        graph = self.make_graph()
+
+        for other in (weighted, graph_view(graph), graph_view(weighted),
+                      graph_view(graph).materialize()):
+            with self.assertRaises(TypeError):
+                other.publish_snapshot()
+            with self.assertRaises(TypeError):
+                other.get_snapshot()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -73,6 +73,46 @@ class TestConnectedComponents(unittest.TestCase):
         self.assertCountEqual(expected_components, actual_components)
 
 
+class TestStronglyConnectedComponents(unittest.TestCase):
+    def make_graph(self):
+        graph = Graph(is_directed=True)
+        graph.add_vertices(['A', 'B', 'C', 'D', 'E', 'F', 'G'])
+        graph.add_edges([
+            ('A','B'), ('B','C'), ('C','A'),
+            ('C','D'), ('D','E'), ('E','D'),
+            ('F','E'), ('G','G'),
+        ])
+        return graph
+
+    def test_strongly_connected_components(self):
+        graph = self.make_graph()
+        components = graph.get_strongly_connected_components()
+        sorted_components = [sorted(comp) for comp in components]
+        self.assertCountEqual(sorted_components, [['A', 'B', 'C'], ['D', 'E'], ['F'], ['G']])
+
+        # components come out in topological order
+        position = {v_id: i for i, comp in enumerate(components) for v_id in comp}
+        self.assertLess(position['A'], position['D'])
+        self.assertLess(position['F'], position['D'])
+
+    def test_condensation(self):
+        graph = self.make_graph()
+        components, dag = graph.get_condensation()
+        self.assertEqual(len(dag.get_vertices()), 4)
+
+        # name each condensed vertex after the smallest id in its component
+        names = [min(comp) for comp in components]
+        edges = sorted((names[v.get_id()], names[n.get_id()])
+                       for v in dag.get_vertices() for n in v.get_neighbors())
+        self.assertEqual(edges, [('A', 'D'), ('F', 'D')])
+
+    def test_long_chain_does_not_recurse(self):
+        graph = Graph(is_directed=True)
+        graph.add_vertices(range(5000))
+        graph.add_edges([(i, i + 1) for i in range(4999)] + [(4999, 0)])
+        self.assertEqual(len(graph.get_strongly_connected_components()), 1)
+
+
 class TestFindPathDfs(unittest.TestCase):
     def test_find_path_dfs(self):
         graph = Graph(is_directed=True)
@@ -86,6 +126,13 @@ class TestFindPathDfs(unittest.TestCase):
         path = graph.find_path_dfs_iter('A', 'C')
         self.assertEqual(path, ['A', 'B', 'C'])
 
+    def test_find_path_dfs_no_path(self):
+        graph = Graph(is_directed=True)
+        graph.add_vertices(['A', 'B'])
+        graph.add_edge('B','A')
+
+        self.assertIsNone(graph.find_path_dfs_iter('A', 'B'))
+
 
 class TestContainsCycle(unittest.TestCase):
     def test_contains_cycle(self):
@@ -0,0 +1,75 @@
+import unittest
+from graphs.graph import Graph
+from graphs.graph_view import graph_view, induced_subgraph, CompactGraph, CompactWeightedGraph
+from graphs.weighted_graph import WeightedGraph
+
+
+class TestGraphView(unittest.TestCase):
+
+    def make_graph(self):
+        # a square A-B-C-D plus a triangle E-F-G
+        graph = Graph(is_directed=False)
+        graph.add_vertices(['A', 'B', 'C', 'D', 'E', 'F', 'G'])
+        graph.add_edges([('A','B'), ('B','C'), ('C','D'), ('D','A'),
+                         ('E','F'), ('F','G'), ('G','E')])
+        return graph
+
+    def test_induced_subgraph(self):
+        graph = self.make_graph()
+        square = induced_subgraph(graph, ['A', 'B', 'C', 'D'])
+
+        self.assertEqual(len(square.get_vertices()), 4)
+        self.assertFalse(square.is_directed_graph())
+        self.assertFalse(square.contains_id('E'))
+        self.assertTrue(square.is_bipartite())
+        self.assertEqual(len(square.get_connected_components()), 1)
+
+        path = induced_subgraph(graph, ['A', 'B', 'C'])
+        self.assertEqual(path.find_shortest_path('A', 'C'), ['A', 'B', 'C'])
+        self.assertEqual(sorted(path.find_vertices_n_away('A', 1)), ['B'])
+
+    def test_edge_filter_follows_graph(self):
+        graph = self.make_graph()
+        view = graph_view(graph, edge_filter=lambda a, b: {a, b} != {'A', 'B'})
+
+        self.assertEqual(len(view.find_shortest_path('A', 'B')), 4)
+        graph.add_edge('A', 'C')
+        self.assertEqual(view.find_shortest_path('A', 'B'), ['A', 'C', 'B'])
+
+        with self.assertRaises(TypeError):
+            view.add_edge('A', 'E')
+
+    def test_weighted_view(self):
+        graph = WeightedGraph(is_directed=False)
+        graph.add_vertices(['A', 'B', 'C', 'D'])
+        graph.add_edges([('A','B', 4), ('A','C', 8), ('B','C', 11), ('B','D', 8), ('C','D', 2)])
+        light = graph_view(graph, edge_filter=lambda a, b, weight: weight < 10)
+
+        self.assertEqual(graph.find_shortest_path('B', 'C'), 10)
+        self.assertEqual(light.find_shortest_path('B', 'C'), 10)
+        without_d = induced_subgraph(graph, ['A', 'B', 'C'])
+        self.assertEqual(without_d.find_shortest_path('B', 'C'), 11)
+        self.assertEqual(sum(w for _, _, w in without_d.minimum_spanning_tree_kruskal()), 12)
+
+    def test_materialize(self):
+        graph = self.make_graph()
+        compact = induced_subgraph(graph, ['E', 'F', 'G']).materialize()
+
+        self.assertIsInstance(compact, CompactGraph)
+        self.assertEqual(list(compact.offsets), [0, 2, 4, 6])
+        self.assertFalse(compact.is_bipartite())
+        graph.remove_vertex('G')
+        self.assertEqual(compact.find_shortest_path('E', 'G'), ['E', 'G'])
+
+        weighted = WeightedGraph(is_directed=True)
+        weighted.add_vertices(['A', 'B', 'C'])
+        weighted.add_edges([('A','B', 1), ('B','C', 2), ('A','C', 5)])
+        compact = graph_view(weighted).materialize()
+        self.assertIsInstance(compact, CompactWeightedGraph)
+        self.assertTrue(compact.is_directed_graph())
+        self.assertEqual(compact.find_shortest_path('A', 'C'), 3)
+        self.assertIsNone(compact.find_shortest_path('C', 'A'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import tempfile
+import unittest
+from collections import Counter
+from graphs.graph import Graph
+from graphs.partition import load_shard, partition_graph, write_shards, ShardCoordinator
+
+
+class TestPartition(unittest.TestCase):
+
+    def make_graph(self):
+        # two 6-vertex cycles joined by one edge, plus a separate pair (12, 13)
+        graph = Graph(is_directed=False)
+        graph.add_vertices(range(14))
+        edges = [(i, (i + 1) % 6) for i in range(6)]
+        edges += [(6 + i, 6 + (i + 1) % 6) for i in range(6)]
+        edges += [(0, 6), (12, 13)]
+        graph.add_edges(edges)
+        return graph
+
+    def test_partition_balanced(self):
+        graph = self.make_graph()
+        assignment = partition_graph(graph, 2, seed=1)
+
+        self.assertEqual(set(assignment), set(range(14)))
+        sizes = Counter(assignment.values())
+        self.assertEqual(set(sizes), {0, 1})
+        self.assertLessEqual(max(sizes.values()), 7)
+
+    def test_shard_files(self):
+        graph = self.make_graph()
+        assignment = partition_graph(graph, 3, seed=1)
+        with tempfile.TemporaryDirectory() as directory:
+            paths = write_shards(graph, assignment, directory)
+            shards = [load_shard(path) for path in paths]
+
+        owned = [vertex_id for shard in shards for vertex_id in shard.adjacency]
+        self.assertEqual(sorted(owned), list(range(14)))
+        for shard in shards:
+            for vertex_id, neighbor_ids in shard.adjacency.items():
+                for n_id in neighbor_ids:
+                    self.assertEqual(shard.owner(n_id), assignment[n_id])
+
+    def test_coordinator(self):
+        graph = self.make_graph()
+        assignment = partition_graph(graph, 3, seed=1)
+        with tempfile.TemporaryDirectory() as directory:
+            paths = write_shards(graph, assignment, directory)
+            with ShardCoordinator(paths) as coordinator:
+                distances = coordinator.bfs(3)
+                components = coordinator.get_connected_components()
+                distances_again = coordinator.bfs(12)
+
+        self.assertEqual(distances[3], 0)
+        self.assertEqual(distances[0], 3)
+        self.assertEqual(distances[9], 7)
+        self.assertNotIn(13, distances)
+        self.assertEqual(distances_again, {12: 0, 13: 1})
+
+        components = sorted(sorted(component) for component in components)
+        self.assertEqual(components, [list(range(12)), [12, 13]])
+
+
+if __name__ == '__main__':
+    unittest.main()
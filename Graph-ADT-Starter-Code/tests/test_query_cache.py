@@ -0,0 +1,83 @@
+import unittest
+from graphs.graph import Graph
+from graphs.graph_view import graph_view
+from graphs.query_cache import QueryCacheMixin
+from graphs.weighted_graph import WeightedGraph
+
+
+class TestQueryCache(unittest.TestCase):
+
+    def test_cache_hits_until_graph_changes(self):
+        graph = Graph(is_directed=False)
+        graph.add_vertices(['A', 'B', 'C', 'D'])
+        graph.add_edges([('A','B'), ('B','C')])
+        cache = graph.enable_query_cache(max_size=8)
+
+        path = graph.find_shortest_path('A', 'C')
+        self.assertIs(graph.find_shortest_path('A', 'C'), path)
+        self.assertEqual(cache.get_stats()['hits'], 1)
+        self.assertEqual(cache.get_stats()['misses'], 1)
+
+        graph.add_edge('C','D')
+        self.assertEqual(graph.find_shortest_path('A', 'D'), ['A', 'B', 'C', 'D'])
+        self.assertEqual(len(graph.get_connected_components()), 1)
+        self.assertTrue(graph.is_bipartite())
+        self.assertEqual(cache.get_stats()['size'], 3)
+
+        graph.remove_edge('B','C')
+        self.assertIsNone(graph.find_shortest_path('A', 'D'))
+        self.assertEqual(cache.get_stats()['misses'], 5)
+
+    def test_cache_evicts_least_recently_used(self):
+        graph = Graph(is_directed=True)
+        graph.add_vertices(['A', 'B', 'C'])
+        graph.add_edges([('A','B'), ('B','C')])
+        cache = graph.enable_query_cache(max_size=2)
+
+        graph.find_shortest_path('A', 'B')
+        graph.find_shortest_path('A', 'C')
+        graph.find_shortest_path('A', 'B')
+        graph.find_shortest_path('B', 'C') # evicts ('A', 'C')
+        graph.find_shortest_path('A', 'B')
+        graph.find_shortest_path('A', 'C')
+
+        self.assertEqual(cache.get_stats()['hits'], 2)
+        self.assertEqual(cache.get_stats()['misses'], 4)
+
+    def test_weighted_graph_cache(self):
+        graph = WeightedGraph(is_directed=False)
+        graph.add_vertices(['A', 'B', 'C'])
+        graph.add_edges([('A','B', 4), ('B','C', 2)])
+        cache = graph.enable_query_cache()
+
+        self.assertEqual(graph.find_shortest_path('A', 'C'), 6)
+        self.assertEqual(graph.find_shortest_path('A', 'C'), 6)
+        self.assertEqual(len(graph.get_connected_components()), 1)
+        self.assertEqual(cache.get_stats()['hits'], 1)
+
+        graph.add_edge('A','C', 1)
+        self.assertEqual(graph.find_shortest_path('A', 'C'), 1)
+
+    def test_view_cache_follows_graph(self):
+        graph = Graph(is_directed=False)
+        graph.add_vertices(['A', 'B', 'C'])
+        graph.add_edges([('A','B'), ('B','C')])
+        view = graph_view(graph, vertex_filter=lambda vertex_id: vertex_id != 'C')
+        cache = view.enable_query_cache()
+
+        self.assertEqual(len(view.get_connected_components()), 1)
+        view.get_connected_components()
+        self.assertEqual(cache.get_stats()['hits'], 1)
+        graph.add_vertex('D')
+        self.assertEqual(len(view.get_connected_components()), 2)
+        self.assertEqual(cache.get_stats()['misses'], 2)
+
+    def test_caching_shared_by_all_graphs(self):
+        for cls in (Graph, WeightedGraph, type(graph_view(Graph()))):
+            for name in ('enable_query_cache', 'disable_query_cache',
+                         'get_query_cache', 'get_shortest_path_tree'):
+                self.assertIs(getattr(cls, name), getattr(QueryCacheMixin, name))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+from graphs.graph import Graph
+from graphs.reachability import ReachabilityIndex
+
+
+class TestReachabilityIndex(unittest.TestCase):
+
+    def make_graph(self):
+        graph = Graph(is_directed=True)
+        graph.add_vertices(['A', 'B', 'C', 'D', 'E', 'F'])
+        graph.add_edges([('A','B'), ('B','C'), ('C','A'), ('C','D'), ('E','D')])
+        return graph
+
+    def test_reaches(self):
+        index = ReachabilityIndex(self.make_graph())
+
+        self.assertTrue(index.reaches('A', 'D'))
+        self.assertTrue(index.reaches('C', 'B'))
+        self.assertTrue(index.reaches('F', 'F'))
+        self.assertFalse(index.reaches('D', 'A'))
+        self.assertFalse(index.reaches('A', 'E'))
+        with self.assertRaises(KeyError):
+            index.reaches('A', 'Z')
+
+    def test_add_edge_updates_index(self):
+        graph = self.make_graph()
+        index = ReachabilityIndex(graph)
+
+        index.add_edge('D', 'F')
+        self.assertTrue(index.reaches('A', 'F'))
+        self.assertTrue(index.reaches('E', 'F'))
+        self.assertFalse(index.reaches('F', 'A'))
+
+        # closing a cycle merges components
+        index.add_edge('F', 'E')
+        self.assertTrue(index.reaches('F', 'D'))
+        self.assertFalse(index.reaches('F', 'A'))
+
+    def test_index_follows_graph_changes(self):
+        graph = self.make_graph()
+        index = ReachabilityIndex(graph)
+        graph.add_edge('D', 'A')
+        self.assertTrue(index.reaches('E', 'B'))
+        graph.remove_edge('C', 'D')
+        self.assertFalse(index.reaches('A', 'D'))
+
+    def test_undirected_graph(self):
+        graph = Graph(is_directed=False)
+        graph.add_vertices(['A', 'B', 'C'])
+        graph.add_edge('A', 'B')
+        index = ReachabilityIndex(graph)
+
+        self.assertFalse(index.reaches('C', 'A'))
+        index.add_edge('B', 'C')
+        self.assertTrue(index.reaches('C', 'A'))
+
+
+if __name__ == '__main__':
+    unittest.main()
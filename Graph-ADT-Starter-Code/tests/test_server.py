@@ -0,0 +1,89 @@
+import asyncio
+import json
+import unittest
+from concurrent.futures.process import BrokenProcessPool
+from server import GraphServer
+
+
+class TestGraphServer(unittest.TestCase):
+
+    def setUp(self):
+        self.server = GraphServer('test_files/graph_medium_undirected.txt', max_workers=2)
+
+    def tearDown(self):
+        asyncio.run(self.server.close())
+
+    def test_socket_queries(self):
+        async def run():
+            await self.server.start()
+            host, port = self.server.get_address()[:2]
+            reader, writer = await asyncio.open_connection(host, port)
+            requests = [
+                {'id': 1, 'op': 'shortest_path', 'args': ['A', 'F']},
+                {'id': 2, 'op': 'n_away', 'args': ['A', 2]},
+                {'id': 3, 'op': 'components'},
+                {'id': 4, 'op': 'mst'},
+                {'id': 5, 'op': 'nope'},
+            ]
+            for request in requests:
+                writer.write((json.dumps(request) + '\n').encode())
+            writer.write(b'[1, 2]\nnot json\n')
+            await writer.drain()
+            responses = {}
+            for _ in range(len(requests) + 2):
+                response = json.loads(await reader.readline())
+                responses.setdefault(response['id'], []).append(response)
+            writer.close()
+            return responses
+
+        responses = asyncio.run(run())
+        self.assertEqual(len(responses[1][0]['result']), 4)
+        self.assertEqual(sorted(responses[2][0]['result']), ['D', 'E'])
+        self.assertEqual(len(responses[3][0]['result']), 1)
+        self.assertIn('weighted', responses[4][0]['error'])
+        self.assertIn('Unknown query', responses[5][0]['error'])
+        errors = sorted(response['error'] for response in responses[None])
+        self.assertEqual(errors, ['A request must be a JSON object', 'Invalid JSON'])
+
+    def test_duplicate_queries_coalesced(self):
+        async def run():
+            first = asyncio.ensure_future(self.server.query('shortest_path', ['A', 'F']))
+            second = asyncio.ensure_future(self.server.query('shortest_path', ['A', 'F']))
+            await asyncio.sleep(0)
+            in_flight = len(self.server.in_flight)
+            results = await asyncio.gather(first, second)
+            return in_flight, results
+
+        in_flight, results = asyncio.run(run())
+        self.assertEqual(in_flight, 1)
+        self.assertEqual(results[0], results[1])
+        self.assertEqual(self.server.in_flight, {})
+
+    def test_bad_file_fails_at_start(self):
+        server = GraphServer('test_files/nope.txt', max_workers=1)
+        try:
+            with self.assertRaises(RuntimeError):
+                asyncio.run(server.start())
+            self.assertIsNone(server.server)
+        finally:
+            asyncio.run(server.close())
+
+    def test_pool_replaced_after_worker_dies(self):
+        async def run():
+            await self.server.warm_up()
+            for process in list(self.server.pool._processes.values()):
+                process.kill()
+            with self.assertRaises(BrokenProcessPool):
+                await self.server.query('components')
+            return await self.server.query('components')
+
+        self.assertEqual(len(asyncio.run(run())), 1)
+
+    def test_timeout(self):
+        self.server.timeout = 0
+        with self.assertRaises(asyncio.TimeoutError):
+            asyncio.run(self.server.query('components'))
+
+
+if __name__ == '__main__':
+    unittest.main()
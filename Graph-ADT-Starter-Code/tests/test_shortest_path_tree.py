@@ -0,0 +1,100 @@
+import unittest
+from random import Random
+from threading import Thread
+from graphs.graph import Graph
+from graphs.weighted_graph import WeightedGraph
+
+
+class TestShortestPathTree(unittest.TestCase):
+
+    def make_weighted_graph(self):
+        graph = WeightedGraph(is_directed=False)
+        graph.add_vertices(['A', 'B', 'C', 'D', 'E', 'F'])
+        graph.add_edges([
+            ('A','B', 4), ('A','C', 1), ('C','B', 2),
+            ('B','D', 5), ('C','D', 8), ('D','E', 3),
+        ])
+        return graph
+
+    def test_weighted_tree_resumes(self):
+        graph = self.make_weighted_graph()
+        tree = graph.get_shortest_path_tree('A')
+
+        self.assertEqual(tree.get_distance('B'), 3)
+        self.assertFalse(tree.is_complete())
+        self.assertEqual(tree.get_path('E'), ['A', 'C', 'B', 'D', 'E'])
+        self.assertEqual(tree.get_distance('E'), 11)
+        self.assertIsNone(tree.get_distance('F'))
+        self.assertTrue(tree.is_complete())
+
+        self.assertIs(graph.get_shortest_path_tree('A'), tree)
+        self.assertEqual(graph.find_shortest_path('A', 'D'), 8)
+        self.assertEqual(graph.find_shortest_path('A', 'A'), 0)
+
+    def test_tree_rebuilt_after_change(self):
+        graph = self.make_weighted_graph()
+        tree = graph.get_shortest_path_tree('A')
+        graph.add_edge('A','E', 2)
+
+        self.assertIsNot(graph.get_shortest_path_tree('A'), tree)
+        self.assertEqual(graph.find_shortest_path('A', 'D'), 5)
+
+    def test_unweighted_tree(self):
+        graph = Graph(is_directed=True)
+        graph.add_vertices(['A', 'B', 'C', 'D'])
+        graph.add_edges([('A','B'), ('B','C'), ('A','C'), ('C','D')])
+        tree = graph.get_shortest_path_tree('A')
+
+        self.assertEqual(tree.get_path('D'), ['A', 'C', 'D'])
+        self.assertEqual(tree.get_distance('C'), 1)
+        self.assertIsNone(graph.find_shortest_path('D', 'A'))
+
+    def check_threaded_queries(self, make_graph):
+        """Threads sharing one tree get the same answers as a single thread."""
+        graph, reference = make_graph(), make_graph()
+        targets = list(range(3000))
+        expected = [reference.find_shortest_path(0, target) for target in targets]
+
+        results = {}
+        errors = []
+        def query(seed):
+            order = list(targets)
+            Random(seed).shuffle(order)
+            try:
+                results[seed] = {target: graph.find_shortest_path(0, target) for target in order}
+            except Exception as error:
+                errors.append(error)
+
+        threads = [Thread(target=query, args=(seed,)) for seed in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        for answers in results.values():
+            self.assertEqual([answers[target] for target in targets], expected)
+
+    def test_threaded_weighted_queries(self):
+        def make_graph():
+            random = Random(1)
+            graph = WeightedGraph(is_directed=False)
+            graph.add_vertices(range(3000))
+            graph.add_edges([(random.randrange(3000), random.randrange(3000), random.randint(1, 9))
+                             for _ in range(9000)])
+            return graph
+        self.check_threaded_queries(make_graph)
+
+    def test_threaded_unweighted_queries(self):
+        def make_graph():
+            random = Random(2)
+            graph = Graph(is_directed=False)
+            graph.add_vertices(range(3000))
+            graph.add_edges([(random.randrange(3000), random.randrange(3000))
+                             for _ in range(6000)])
+            return graph
+        self.check_threaded_queries(make_graph)
+
+
+if __name__ == '__main__':
+    unittest.main()
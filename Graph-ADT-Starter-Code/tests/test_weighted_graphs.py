@@ -1,6 +1,7 @@
 import unittest
+from itertools import islice
 from graphs.graph import Graph
-from graphs.weighted_graph import WeightedGraph
+from graphs.weighted_graph import WeightedGraph, NegativeCycleError
 
 
 class TestGraph(unittest.TestCase):
@@ -69,5 +70,88 @@ class TestGraph(unittest.TestCase):
         self.assertEqual(
             graph.find_shortest_path('A', 'J'), expected_shortest_path)
 
+    def test_bulk_construction(self):
+        graph = WeightedGraph(is_directed=False)
+        self.assertEqual(graph.add_vertices(['A', 'B', 'C', 'A']), 3)
+        self.assertTrue(graph.add_edges([('A','B', 4), ('B','C', 2), ('A','C', 9)]))
+        self.assertFalse(graph.add_edges([('A','Z', 1)]))
+
+        self.assertEqual(len(graph.get_vertex('A').get_neighbors()), 2)
+        self.assertEqual(graph.find_shortest_path('A', 'C'), 6)
+
+    def test_remove_edge_and_vertex(self):
+        graph = self.make_large_graph()
+        self.assertTrue(graph.remove_edge('D','E'))
+        self.assertFalse(graph.remove_edge('E','D'))
+        self.assertTrue(graph.remove_vertex('F'))
+        self.assertFalse(graph.remove_vertex('F'))
+
+        self.assertEqual(len(graph.get_vertices()), 8)
+        neighbor_ids = [n.get_id() for n in graph.get_vertex('C').get_neighbors()]
+        self.assertEqual(sorted(neighbor_ids), ['A', 'B', 'E'])
+
+    def test_remove_vertex_directed(self):
+        graph = WeightedGraph(is_directed=True)
+        graph.add_vertices(['A', 'B', 'C'])
+        graph.add_edges([('A','B', 1), ('C','B', 2), ('B','C', 3)])
+        self.assertTrue(graph.remove_vertex('B'))
+
+        self.assertEqual(graph.get_vertex('A').get_neighbors(), [])
+        self.assertEqual(graph.get_vertex('C').get_neighbors(), [])
+
+    def make_negative_graph(self):
+        graph = WeightedGraph(is_directed=True)
+        graph.add_vertices(['A', 'B', 'C', 'D'])
+        graph.add_edges([('A','B', 5), ('A','C', 6), ('C','B', -10), ('B','D', 2)])
+        return graph
+
+    def test_negative_weights(self):
+        graph = self.make_negative_graph()
+
+        self.assertEqual(graph.find_shortest_path('A', 'B'), -4)
+        self.assertEqual(graph.bellman_ford('A'),
+                         {'A': 0, 'B': -4, 'C': 6, 'D': -2})
+        self.assertEqual(graph.bellman_ford('D')['A'], WeightedGraph.INFINITY)
+
+    def test_negative_cycle(self):
+        graph = self.make_negative_graph()
+        graph.add_edge('D','C', 1)
+
+        with self.assertRaises(NegativeCycleError) as error:
+            graph.bellman_ford('A')
+        self.assertCountEqual(error.exception.cycle, ['B', 'D', 'C'])
+        with self.assertRaises(NegativeCycleError):
+            graph.johnson()
+
+    def test_johnson(self):
+        graph = self.make_negative_graph()
+        dist = graph.johnson()
+
+        self.assertEqual(dist['A'], {'A': 0, 'B': -4, 'C': 6, 'D': -2})
+        self.assertEqual(dist['C']['D'], -8)
+        self.assertEqual(dist['B']['A'], WeightedGraph.INFINITY)
+
+        large = self.make_large_graph()
+        dist = large.johnson(processes=2)
+        self.assertEqual(dist['A']['J'], 21)
+        self.assertEqual(dist['J']['A'], 21)
+
+    def test_k_shortest_paths(self):
+        graph = self.make_large_graph()
+        paths = list(islice(graph.k_shortest_paths('A', 'J'), 3))
+
+        self.assertEqual(paths[0], (21, ['A', 'C', 'F', 'H', 'J']))
+        self.assertEqual([weight for weight, path in paths], [21, 26, 28])
+        self.assertEqual(len(set(tuple(path) for weight, path in paths)), 3)
+
+    def test_k_shortest_paths_runs_out(self):
+        graph = WeightedGraph(is_directed=True)
+        graph.add_vertices(['A', 'B', 'C', 'D'])
+        graph.add_edges([('A','B', 1), ('B','C', 1), ('A','C', 3)])
+
+        self.assertEqual(list(graph.k_shortest_paths('A', 'C')),
+                         [(2, ['A', 'B', 'C']), (3, ['A', 'C'])])
+        self.assertEqual(list(graph.k_shortest_paths('A', 'D')), [])
+
 if __name__ == '__main__':
     unittest.main()
@@ -1,4 +1,4 @@
-from graphs.graph import Graph
+from util.graph_io import read_graph
 
 def read_graph_from_file(filename):
     """
@@ -10,29 +10,13 @@ def read_graph_from_file(filename):
 
     Returns:
     Graph: A directed or undirected Graph object containing the specified
-    vertices and edges
+    vertices and edges, or a WeightedGraph if the edges are (a,b,weight)
     """
 
-    # Use 'open' to open the file
-    f = open(filename, "r").read().split()
-
-    # Use the first line (G or D) to determine whether graph is directed
-    # and create a graph object
-    is_directed = True if f[0] == "D" else False
-    graph = Graph(is_directed=is_directed)
-
-    # Use the second line to add the vertices to the graph
-    vertices = f[1].split(',')
-    for v in vertices:
-        graph.add_vertex(v)
-
-    # Use the 3rd+ line to add the edges to the graph
-    edges = f[2:]
-    for e in edges:
-        v1, v2 = e.strip(')(').split(',')
-        graph.add_edge(v1, v2)
-    
-    return graph
+    # The first line (G or D) says whether the graph is directed, the second
+    # lists the vertices and the rest are edges; see `read_graph` for the
+    # other formats and compressed files.
+    return read_graph(filename, file_format='graph')
 
 
 if __name__ == '__main__':
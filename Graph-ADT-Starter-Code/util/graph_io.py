@@ -0,0 +1,174 @@
+import gzip
+from itertools import chain
+
+from graphs.graph import Graph
+from graphs.weighted_graph import WeightedGraph
+
+try:
+    from compression import zstd # in the standard library from Python 3.14
+except ImportError:
+    zstd = None
+
+
+def open_text(filename, mode='r'):
+    """
+    Open a graph file as text, compressed or not depending on its extension:
+    '.gz' for gzip and '.zst' for zstd (only where the standard library has it).
+    The file is read or written as a stream, never all at once.
+    """
+    if filename.endswith('.gz'):
+        return gzip.open(filename, mode + 't')
+    if filename.endswith('.zst'):
+        if zstd is None:
+            raise ValueError("Reading or writing .zst files needs Python 3.14 or later")
+        return zstd.open(filename, mode + 't')
+    return open(filename, mode)
+
+
+def _parse_weight(text):
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def _parse_lines(lines, file_format):
+    """
+    Parse lines of edges into tuples: (a, b) or (a, b, weight), plus (a,) for
+    a vertex on its own line in an edge list. The lines are read one at a time
+    from the open file, so the text is never held in memory all at once.
+    """
+    edges = []
+    if file_format == 'graph':
+        fields_list = (token.strip(')(').split(',') for line in lines for token in line.split())
+    else:
+        fields_list = (line.split() for line in lines
+                       if line.strip() and not line.lstrip().startswith('#'))
+
+    for fields in fields_list:
+        if len(fields) == 3:
+            edges.append((fields[0], fields[1], _parse_weight(fields[2])))
+        elif len(fields) == 2 or (len(fields) == 1 and file_format == 'edgelist'):
+            edges.append(tuple(fields))
+        else:
+            raise ValueError(f"Can't parse edge: {fields}")
+    return edges
+
+
+def read_graph(filename, file_format=None, is_directed=True):
+    """
+    Read a graph file and return a Graph, or a WeightedGraph if the edges
+    have weights.
+
+    Two formats are understood:
+    - 'graph': a first line of G (undirected) or D (directed), a line of
+      comma-separated vertex ids, then edges as (a,b) or (a,b,weight).
+    - 'edgelist': one edge per line as `a b` or `a b weight`, separated by
+      whitespace. A line with a single id adds a vertex with no edges, and
+      lines starting with # are skipped, except that a first line of
+      `# directed` or `# undirected` says whether the graph is directed.
+
+    Parameters:
+    filename (string): The path of the file. Files ending in .gz (or .zst,
+        if available) are decompressed as they are read.
+    file_format (string): 'graph' or 'edgelist'. If None, it is 'graph' when
+        the first line is G or D, and 'edgelist' otherwise.
+    is_directed (boolean): Whether an edge list without a `# directed` or
+        `# undirected` first line describes a directed graph. Files that say
+        so themselves ignore this.
+
+    Returns:
+    Graph or WeightedGraph: The graph, built with `add_vertices` and `add_edges`.
+    """
+    if file_format not in (None, 'graph', 'edgelist'):
+        raise ValueError(f"Unknown file format: {file_format}")
+
+    with open_text(filename) as f:
+        vertex_ids = []
+        header = f.readline().strip()
+        if file_format is None:
+            file_format = 'graph' if header in ('G', 'D') else 'edgelist'
+
+        if file_format == 'graph':
+            if header not in ('G', 'D'):
+                raise ValueError(f"The first line must be G or D, not {header!r}")
+            is_directed = header == 'D'
+            vertex_line = f.readline().strip()
+            vertex_ids = vertex_line.split(',') if vertex_line else []
+            lines = f
+        else:
+            if header in ('# directed', '# undirected'):
+                is_directed = header == '# directed'
+            lines = chain([header], f) # put the first line back
+        edges = _parse_lines(lines, file_format)
+
+    lengths = {len(edge) for edge in edges}
+    if file_format == 'edgelist':
+        vertex_ids = list(dict.fromkeys(vertex_id for edge in edges for vertex_id in edge[:2]))
+        edges = [edge for edge in edges if len(edge) > 1]
+        lengths.discard(1)
+    if lengths == {2, 3}:
+        raise ValueError("The edges must all be weighted or all be unweighted")
+
+    if lengths == {3}:
+        graph = WeightedGraph(is_directed=is_directed)
+        graph.add_vertices(vertex_ids)
+        if not graph.add_edges(edges):
+            raise KeyError("One or both vertices are not in the graph!")
+    else:
+        graph = Graph(is_directed=is_directed)
+        graph.add_vertices(vertex_ids)
+        graph.add_edges(edges)
+    return graph
+
+
+def write_graph(graph, filename, file_format='graph'):
+    """
+    Write a Graph or WeightedGraph to a file that `read_graph` can read back.
+    Edges of an undirected graph are written once. Edge lists start with a
+    `# directed` or `# undirected` line, so they read back the same way.
+
+    Parameters:
+    graph (Graph): The graph to write.
+    filename (string): The path of the file. Files ending in .gz (or .zst,
+        if available) are compressed as they are written.
+    file_format (string): 'graph' or 'edgelist'.
+    """
+    if file_format not in ('graph', 'edgelist'):
+        raise ValueError(f"Unknown file format: {file_format}")
+    weighted = isinstance(graph, WeightedGraph)
+    is_directed = graph.is_directed_graph()
+
+    with open_text(filename, 'w') as f:
+        vertices = graph.get_vertices()
+        if file_format == 'graph':
+            f.write('D\n' if is_directed else 'G\n')
+            f.write(','.join(str(vertex.get_id()) for vertex in vertices) + '\n')
+        else:
+            f.write('# directed\n' if is_directed else '# undirected\n')
+        separator = ',' if file_format == 'graph' else ' '
+
+        written = set()
+        for vertex in vertices:
+            vertex_id = vertex.get_id()
+            if weighted:
+                neighbors = vertex.get_neighbors_with_weights()
+            else:
+                neighbors = ((neighbor, None) for neighbor in vertex.get_neighbors())
+
+            has_edges = False
+            for neighbor, weight in neighbors:
+                has_edges = True
+                neighbor_id = neighbor.get_id()
+                if not is_directed:
+                    if (neighbor_id, vertex_id) in written:
+                        continue
+                    written.add((vertex_id, neighbor_id))
+                fields = [str(vertex_id), str(neighbor_id)]
+                if weighted:
+                    fields.append(str(weight))
+                line = separator.join(fields)
+                f.write(f'({line})\n' if file_format == 'graph' else line + '\n')
+
+            if file_format == 'edgelist' and not has_edges:
+                f.write(f'{vertex_id}\n')